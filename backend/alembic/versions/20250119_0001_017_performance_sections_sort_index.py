@@ -0,0 +1,31 @@
+"""Composite index for ordered performance sections.
+
+Revision ID: 017_performance_sections_sort_index
+Revises: 016_inventory_enhancement
+Create Date: 2026-01-19
+
+Changes:
+- Add (performance_id, sort_order) index on performance_sections so that
+  Performance.sections is returned already ordered by sort_order
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '017_performance_sections_sort_index'
+down_revision: Union[str, None] = '016_inventory_enhancement'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_performance_sections_perf_sort',
+        'performance_sections',
+        ['performance_id', 'sort_order']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_performance_sections_perf_sort', table_name='performance_sections')
@@ -0,0 +1,62 @@
+"""Denormalized completion counters on checklist instances.
+
+Revision ID: 018_checklist_instance_counters
+Revises: 017_performance_sections_sort_index
+Create Date: 2026-01-19
+
+Changes:
+- Add total_items, completed_items, completion_percentage columns to
+  checklist_instances and backfill them from completion_data
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '018_checklist_instance_counters'
+down_revision: Union[str, None] = '017_performance_sections_sort_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'checklist_instances',
+        sa.Column('total_items', sa.Integer(), nullable=False, server_default='0')
+    )
+    op.add_column(
+        'checklist_instances',
+        sa.Column('completed_items', sa.Integer(), nullable=False, server_default='0')
+    )
+    op.add_column(
+        'checklist_instances',
+        sa.Column('completion_percentage', sa.Integer(), nullable=False, server_default='0')
+    )
+
+    # Заполняем счётчики из существующих completion_data
+    op.execute("""
+        UPDATE checklist_instances
+        SET
+            total_items = jsonb_array_length(
+                COALESCE(completion_data->'items', '[]'::jsonb)
+            ),
+            completed_items = (
+                SELECT count(*)
+                FROM jsonb_array_elements(
+                    COALESCE(completion_data->'items', '[]'::jsonb)
+                ) AS item
+                WHERE COALESCE((item->>'is_checked')::boolean, false)
+            )
+    """)
+    op.execute("""
+        UPDATE checklist_instances
+        SET completion_percentage = completed_items * 100 / total_items
+        WHERE total_items > 0
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('checklist_instances', 'completion_percentage')
+    op.drop_column('checklist_instances', 'completed_items')
+    op.drop_column('checklist_instances', 'total_items')
@@ -0,0 +1,52 @@
+"""Composite (performance_id, id) indexes for Performance Hub links.
+
+Revision ID: 019_hub_perf_id_indexes
+Revises: 018_checklist_instance_counters
+Create Date: 2026-01-19
+
+Changes:
+- Add (performance_id, id) indexes on performance_inventory and
+  performance_cast for the WHERE id = ... AND performance_id = ... guards
+  used by update/remove endpoints
+- Indexes are built CONCURRENTLY to avoid locking writes
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '019_hub_perf_id_indexes'
+down_revision: Union[str, None] = '018_checklist_instance_counters'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_performance_inventory_perf_id_id',
+            'performance_inventory',
+            ['performance_id', 'id'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_performance_cast_perf_id_id',
+            'performance_cast',
+            ['performance_id', 'id'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_performance_cast_perf_id_id',
+            table_name='performance_cast',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_performance_inventory_perf_id_id',
+            table_name='performance_inventory',
+            postgresql_concurrently=True,
+        )
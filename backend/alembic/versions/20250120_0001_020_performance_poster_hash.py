@@ -0,0 +1,31 @@
+"""Content hash of the performance poster.
+
+Revision ID: 020_performance_poster_hash
+Revises: 019_hub_perf_id_indexes
+Create Date: 2026-01-20
+
+Changes:
+- Add nullable poster_hash (BLAKE2b hex digest) to performances so that
+  re-uploading an identical poster can skip replacing the file
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '020_performance_poster_hash'
+down_revision: Union[str, None] = '019_hub_perf_id_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'performances',
+        sa.Column('poster_hash', sa.String(64), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('performances', 'poster_hash')
@@ -48,6 +48,10 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """
     Получить сессию базы данных.
     
+    Подключается с scope="function": commit в get_session выполняется
+    до отправки ответа, поэтому клиент не получит успешный ответ
+    на незафиксированные изменения.
+    
     Yields:
         AsyncSession для работы с БД
     """
@@ -56,7 +60,7 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
 
 
 def get_auth_service(
-    session: Annotated[AsyncSession, Depends(get_db_session)],
+    session: Annotated[AsyncSession, Depends(get_db_session, scope="function")],
     redis: Annotated[RedisService, Depends(get_redis)],
 ) -> AuthService:
     """Получить сервис аутентификации."""
@@ -65,7 +69,7 @@ def get_auth_service(
 
 async def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(bearer_scheme)],
-    session: Annotated[AsyncSession, Depends(get_db_session)],
+    session: Annotated[AsyncSession, Depends(get_db_session, scope="function")],
     redis: Annotated[RedisService, Depends(get_redis)],
 ) -> CurrentUser:
     """
@@ -183,7 +187,9 @@ async def get_current_superuser(
 
 
 # Аннотированные типы для удобства
-SessionDep = Annotated[AsyncSession, Depends(get_db_session)]
+SessionDep = Annotated[AsyncSession, Depends(get_db_session, scope="function")]
+# Для StreamingResponse: сессия закрывается после отправки тела ответа
+StreamSessionDep = Annotated[AsyncSession, Depends(get_db_session)]
 RedisDep = Annotated[RedisService, Depends(get_redis)]
 AuthServiceDep = Annotated[AuthService, Depends(get_auth_service)]
 CurrentUserDep = Annotated[CurrentUser, Depends(get_current_user)]
@@ -33,7 +33,7 @@ router = APIRouter(prefix="/document-generation", tags=["Document Generation"])
 # =============================================================================
 
 def get_generation_service(
-    session: Annotated[AsyncSession, Depends(get_db_session)],
+    session: Annotated[AsyncSession, Depends(get_db_session, scope="function")],
 ) -> DocumentGenerationService:
     """Получить сервис генерации документов."""
     return DocumentGenerationService(session)
@@ -9,7 +9,7 @@ API ÑÐ½Ð´Ð¿Ð¾Ð¸Ð½Ñ‚Ñ‹ Ð¼Ð¾Ð´ÑƒÐ»Ñ Ð¸Ð½Ð²
 """
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile, status
 
 from app.api.deps import CurrentUserDep, SessionDep
 from app.core.exceptions import NotFoundError, AlreadyExistsError, ValidationError
@@ -1039,6 +1039,7 @@ async def bulk_update_category(
 )
 async def get_item_qr_code(
     item_id: int,
+    request: Request,
     current_user: CurrentUserDep,
     service: InventoryService = InventoryServiceDep,
     size: int = Query(300, ge=100, le=1000, description="Размер QR-кода в пикселях"),
@@ -1046,8 +1047,8 @@ async def get_item_qr_code(
 ):
     """Получить QR-код для предмета инвентаря."""
     from fastapi.responses import Response
-    from app.services.qr_code_service import QRCodeService
-    from app.core.config import settings
+    from app.services.qr_code_service import QRCodeService, QRStyle
+    from app.config import settings
 
     # Проверяем существование предмета
     try:
@@ -1055,16 +1056,31 @@ async def get_item_qr_code(
     except NotFoundError as e:
         raise HTTPException(status.HTTP_404_NOT_FOUND, e.detail)
 
-    # Генерируем QR-код
     qr_service = QRCodeService(base_url=str(settings.FRONTEND_URL) if hasattr(settings, 'FRONTEND_URL') else None)
-    qr_bytes = qr_service.generate_inventory_qr(
+    qr_style: QRStyle = "square" if style == "square" else "rounded"
+
+    # Условный запрос: изображение у клиента актуально — не генерируем заново
+    etag = qr_service.inventory_qr_etag(item.id, item.inventory_number, qr_style, size)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, max-age=31536000, immutable",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or etag in (tag.strip() for tag in if_none_match.split(","))
+    ):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # Генерируем QR-код (в пуле процессов, не блокируя event loop)
+    qr_bytes = await qr_service.generate_inventory_qr_async(
         item_id=item.id,
         inventory_number=item.inventory_number,
-        style=style if style in ("square", "rounded") else "rounded",
+        style=qr_style,
         size=size,
     )
 
-    return Response(content=qr_bytes, media_type="image/png")
+    return Response(content=qr_bytes, media_type="image/png", headers=headers)
 
 
 @router.post(
@@ -1081,25 +1097,34 @@ async def generate_batch_qr_codes(
     """Генерация QR-кодов пакетом (возвращает base64)."""
     import base64
     from app.services.qr_code_service import QRCodeService
-    from app.core.config import settings
+    from app.config import settings
 
     qr_service = QRCodeService(base_url=str(settings.FRONTEND_URL) if hasattr(settings, 'FRONTEND_URL') else None)
 
-    results = []
+    # Сначала собираем предметы, затем генерируем все QR-коды
+    # параллельно в пуле процессов
+    found: dict[int, str] = {}
     for item_id in item_ids:
         try:
             item = await service.get_item(item_id)
-            qr_bytes = qr_service.generate_inventory_qr(
-                item_id=item.id,
-                inventory_number=item.inventory_number,
-                size=size,
-            )
+            found[item_id] = item.inventory_number
+        except NotFoundError:
+            continue
+
+    images = dict(await qr_service.generate_batch_qr_async(
+        list(found.items()),
+        size=size,
+    ))
+
+    results = []
+    for item_id in item_ids:
+        if item_id in found:
             results.append({
-                "item_id": item.id,
-                "inventory_number": item.inventory_number,
-                "qr_base64": base64.b64encode(qr_bytes).decode("utf-8"),
+                "item_id": item_id,
+                "inventory_number": found[item_id],
+                "qr_base64": base64.b64encode(images[item_id]).decode("utf-8"),
             })
-        except NotFoundError:
+        else:
             results.append({
                 "item_id": item_id,
                 "error": "Предмет не найден",
@@ -1139,8 +1164,8 @@ async def generate_label_sheet(
     if not items_data:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Предметы не найдены")
 
-    # Генерируем лист
-    sheet_bytes = qr_service.generate_label_sheet(
+    # Генерируем лист (в пуле процессов, не блокируя event loop)
+    sheet_bytes = await qr_service.generate_label_sheet_async(
         items=items_data,
         cols=cols,
         rows=rows,
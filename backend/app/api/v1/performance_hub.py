@@ -5,14 +5,19 @@ API эндпоинты Performance Hub.
 - /performances/{id}/structure — структура спектакля
 - /performances/{id}/snapshot — версионирование
 - /performances/{id}/inventory — связь с инвентарём (Hub)
+- /performances/{id}/inventory/stream — потоковая выгрузка инвентаря
 - /performances/{id}/cast — каст и персонал
+- /performances/{id}/cast/stream — потоковая выгрузка каста
 - /checklists/templates — шаблоны чеклистов
 - /performances/{id}/checklists — экземпляры чеклистов
 """
+from collections.abc import AsyncIterator, Sequence
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
 
-from app.api.deps import CurrentUserDep, SessionDep
+from app.api.deps import CurrentUserDep, SessionDep, StreamSessionDep
 from app.schemas.base import MessageResponse
 from app.schemas.performance import (
     PerformanceInventoryLinkCreate,
@@ -20,6 +25,7 @@ from app.schemas.performance import (
     PerformanceInventoryLinkResponse,
     PerformanceSnapshotCreate,
     PerformanceSnapshotResponse,
+    PerformanceStructureResponse,
 )
 from app.schemas.checklist_hub import (
     ChecklistTemplateCreate,
@@ -53,12 +59,57 @@ async def get_hub_service(session: SessionDep) -> PerformanceHubService:
 HubServiceDep = Depends(get_hub_service)
 
 
+async def _stream_json_array(
+    first: Sequence[BaseModel],
+    rest: AsyncIterator[Sequence[BaseModel]],
+) -> AsyncIterator[bytes]:
+    """Отдать пачки схем как один JSON-массив по мере чтения из БД."""
+    yield b"["
+    separator = b""
+    if first:
+        yield b",".join(item.model_dump_json().encode() for item in first)
+        separator = b","
+    async for partition in rest:
+        if partition:
+            yield separator + b",".join(
+                item.model_dump_json().encode() for item in partition
+            )
+            separator = b","
+    yield b"]"
+
+
+async def _json_array_response(
+    service: PerformanceHubService,
+    performance_id: int,
+    partitions: AsyncIterator[Sequence[BaseModel]],
+) -> StreamingResponse:
+    """
+    Потоковый JSON-ответ со списком объектов спектакля.
+
+    Первая пачка читается до отправки заголовков: несуществующий
+    спектакль даёт 404, а ошибка запроса — обычный ответ с ошибкой,
+    а не 200 с обрезанным JSON. Ошибка на следующих пачках обрывает
+    соединение без завершающего блока, и клиент видит незавершённый ответ.
+    """
+    first = await anext(partitions, [])
+    if not first and not await service.performance_exists(performance_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Спектакль {performance_id} не найден",
+        )
+    return StreamingResponse(
+        _stream_json_array(first, partitions),
+        media_type="application/json",
+    )
+
+
 # =============================================================================
 # Performance Structure Endpoints
 # =============================================================================
 
 @router.get(
     "/performances/{performance_id}/structure",
+    response_model=PerformanceStructureResponse,
     summary="Получить полную структуру спектакля",
 )
 async def get_performance_structure(
@@ -127,6 +178,28 @@ async def add_inventory_link(
         )
 
 
+@router.get(
+    "/performances/{performance_id}/inventory/stream",
+    response_model=list[PerformanceInventoryLinkResponse],
+    summary="Потоковая выгрузка инвентаря спектакля",
+)
+async def stream_inventory_links(
+    performance_id: int,
+    current_user: CurrentUserDep,
+    session: StreamSessionDep,
+):
+    """
+    Получить все связи инвентаря спектакля потоком.
+
+    Для спектаклей с сотнями связей: строки читаются страницами
+    и сериализуются пачками, не собираясь целиком в памяти.
+    """
+    service = PerformanceHubService(session)
+    return await _json_array_response(
+        service, performance_id, service.stream_inventory_links(performance_id)
+    )
+
+
 @router.patch(
     "/performances/{performance_id}/inventory/{link_id}",
     response_model=PerformanceInventoryLinkResponse,
@@ -264,6 +337,23 @@ async def get_cast_crew(
     return await service.get_cast_crew(performance_id)
 
 
+@router.get(
+    "/performances/{performance_id}/cast/stream",
+    response_model=list[PerformanceCastResponse],
+    summary="Потоковая выгрузка каста и персонала",
+)
+async def stream_cast_members(
+    performance_id: int,
+    current_user: CurrentUserDep,
+    session: StreamSessionDep,
+):
+    """Получить всех участников спектакля потоком (без группировки)."""
+    service = PerformanceHubService(session)
+    return await _json_array_response(
+        service, performance_id, service.stream_cast_members(performance_id)
+    )
+
+
 @router.post(
     "/performances/{performance_id}/cast",
     response_model=PerformanceCastResponse,
@@ -156,8 +156,7 @@ async def get_performance(
 ):
     """Получить спектакль по ID."""
     try:
-        performance = await service.get_performance(performance_id)
-        return _performance_to_response(performance)
+        return await service.get_performance_response(performance_id)
     except NotFoundError as e:
         raise HTTPException(status.HTTP_404_NOT_FOUND, e.detail)
 
@@ -57,6 +57,18 @@ class Settings(BaseSettings):
     
     # Можно задать напрямую, иначе будет собран из компонентов
     DATABASE_URL: str | None = None
+
+    # Размер страницы для многострочных INSERT ... VALUES (executemany)
+    DB_INSERTMANYVALUES_PAGE_SIZE: int = 1000
+
+    # Размер LRU-кэша скомпилированных SQL-выражений SQLAlchemy
+    DB_QUERY_CACHE_SIZE: int = 1200
+
+    # Пул соединений: постоянные соединения (открываются при старте),
+    # дополнительные под пиковую нагрузку и время жизни соединения (сек)
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_RECYCLE: int = 1800
     
     @computed_field  # type: ignore[misc]
     @property
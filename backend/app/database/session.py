@@ -3,17 +3,26 @@
 
 Содержит async session factory и функции жизненного цикла.
 """
-from collections.abc import AsyncGenerator
+import asyncio
+from collections.abc import AsyncGenerator, Callable
+from typing import cast
+from contextlib import AsyncExitStack
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.orm import Session, SessionTransaction
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import settings
 
+# Ключ в Session.info для действий, отложенных до commit
+_AFTER_COMMIT_KEY = "after_commit_callbacks"
+
 # Глобальный engine (инициализируется в init_db)
 _engine: AsyncEngine | None = None
 _async_session_factory: async_sessionmaker[AsyncSession] | None = None
@@ -48,16 +57,20 @@ async def init_db() -> None:
     Инициализировать подключение к базе данных.
     
     Вызывается при старте приложения (lifespan).
-    Создаёт engine и фабрику сессий.
+    Создаёт engine и фабрику сессий, прогревает пул соединений.
     """
     global _engine, _async_session_factory
     
     _engine = create_async_engine(
         settings.database_url,
         echo=settings.DEBUG,
+        poolclass=AsyncAdaptedQueuePool,
         pool_pre_ping=True,
-        pool_size=5,
-        max_overflow=10,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        insertmanyvalues_page_size=settings.DB_INSERTMANYVALUES_PAGE_SIZE,
+        query_cache_size=settings.DB_QUERY_CACHE_SIZE,
         connect_args={
             "server_settings": {
                 "client_encoding": "utf8"
@@ -71,6 +84,45 @@ async def init_db() -> None:
         expire_on_commit=False,
         autoflush=False,
     )
+    
+    await _warm_up_pool(_engine, settings.DB_POOL_SIZE)
+
+
+async def _warm_up_pool(engine: AsyncEngine, size: int) -> None:
+    """
+    Заранее открыть постоянные соединения пула.
+    
+    Первая волна запросов после старта не упирается в одновременное
+    установление соединений с PostgreSQL.
+    """
+    async with AsyncExitStack() as stack:
+        await asyncio.gather(
+            *(stack.enter_async_context(engine.connect()) for _ in range(size))
+        )
+
+
+def get_pool_stats() -> dict[str, int] | None:
+    """
+    Текущая загрузка пула соединений.
+    
+    По этим числам подбираются DB_POOL_SIZE и DB_MAX_OVERFLOW:
+    если checked_out регулярно упирается в size + max_overflow,
+    запросы ждут свободного соединения.
+    
+    Returns:
+        Счётчики пула или None, если БД не инициализирована
+    """
+    if _engine is None:
+        return None
+    # init_db создаёт engine с AsyncAdaptedQueuePool
+    pool = cast(AsyncAdaptedQueuePool, _engine.pool)
+    return {
+        "size": pool.size(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
 
 
 async def close_db() -> None:
@@ -95,8 +147,9 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         async def get_items(session: AsyncSession = Depends(get_session)):
             ...
     
+    Сессия — единица работы запроса: commit выполняется один раз
+    после успешной обработки, при исключении происходит rollback.
     Сессия автоматически закрывается после выполнения запроса.
-    При возникновении исключения происходит rollback.
     
     Yields:
         AsyncSession для работы с БД
@@ -111,6 +164,47 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
             raise
 
 
+def call_after_commit(
+    session: AsyncSession,
+    callback: Callable[[], None],
+    on_rollback: Callable[[], None] | None = None,
+) -> None:
+    """
+    Выполнить действие после commit текущей транзакции.
+    
+    Транзакцию фиксирует get_session уже после возврата из сервиса,
+    поэтому побочные эффекты вне БД (файлы, кэши в памяти) откладываются
+    до фактического commit. Если транзакция откатывается или сессия
+    закрывается без commit, вызывается on_rollback.
+    
+    Args:
+        session: Сессия запроса
+        callback: Действие после успешного commit
+        on_rollback: Действие при откате (например, удаление временного файла)
+    """
+    session.info.setdefault(_AFTER_COMMIT_KEY, []).append((callback, on_rollback))
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session: Session) -> None:
+    """Выполнить отложенные действия зафиксированной транзакции."""
+    if session.in_nested_transaction():
+        # Событие приходит и для SAVEPOINT — ждём внешний commit
+        return
+    for callback, _ in session.info.pop(_AFTER_COMMIT_KEY, ()):
+        callback()
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_after_commit(session: Session, transaction: SessionTransaction) -> None:
+    """Отменить действия транзакции, завершившейся без commit."""
+    if transaction.parent is not None:
+        return
+    for _, on_rollback in session.info.pop(_AFTER_COMMIT_KEY, ()):
+        if on_rollback is not None:
+            on_rollback()
+
+
 def async_session_factory() -> AsyncSession:
     """
     Создать новую сессию базы данных.
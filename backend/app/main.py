@@ -7,14 +7,15 @@
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from app.api.deps import get_current_superuser
 from app.api.v1.router import api_router
 from app.config import settings
 from app.core.exceptions import TheatreException
-from app.database.session import init_db, close_db
+from app.database.session import close_db, get_pool_stats, init_db
 
 
 @asynccontextmanager
@@ -26,9 +27,10 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     - Инициализация подключения к БД
     - Инициализация Redis
     - Инициализация MinIO бакетов
-    - Освобождение ресурсов при остановке
+    - Освобождение ресурсов при остановке (включая пул процессов QR)
     """
     from app.services.minio_service import minio_service
+    from app.services.qr_code_service import shutdown_qr_executor
     from app.services.redis_service import redis_service
 
     # Startup
@@ -37,6 +39,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     await minio_service.init_buckets()
     yield
     # Shutdown
+    shutdown_qr_executor()
     await redis_service.disconnect()
     await close_db()
 
@@ -99,6 +102,16 @@ def create_application() -> FastAPI:
         """Проверка работоспособности сервиса."""
         return {"status": "healthy"}
     
+    # Загрузка пула соединений БД — только для администраторов
+    @app.get(
+        "/health/db-pool",
+        tags=["Health"],
+        dependencies=[Depends(get_current_superuser)],
+    )
+    async def db_pool_stats() -> dict[str, int] | None:
+        """Счётчики пула соединений для подбора DB_POOL_SIZE/DB_MAX_OVERFLOW."""
+        return get_pool_stats()
+    
     # API v1
     app.include_router(api_router, prefix=settings.API_V1_PREFIX)
     
@@ -141,6 +141,18 @@ class ChecklistInstance(Base, TimestampMixin):
     #           checked_by_id?: int, checked_at?: datetime}]}
     completion_data: Mapped[dict] = mapped_column(JSONB, default=dict, nullable=False)
 
+    # Денормализованные счётчики выполнения.
+    # Обновляются вместе с completion_data через set_completion_counters().
+    total_items: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    completed_items: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    completion_percentage: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+
     # Связи
     performance: Mapped["Performance"] = relationship(
         "Performance",
@@ -149,26 +161,14 @@ class ChecklistInstance(Base, TimestampMixin):
     template: Mapped["ChecklistTemplate | None"] = relationship(
         "ChecklistTemplate",
         back_populates="instances",
+        lazy="selectin",
     )
 
-    @property
-    def total_items(self) -> int:
-        """Общее количество элементов."""
-        items = self.completion_data.get("items", [])
-        return len(items)
-
-    @property
-    def completed_items(self) -> int:
-        """Количество выполненных элементов."""
-        items = self.completion_data.get("items", [])
-        return sum(1 for item in items if item.get("is_checked", False))
-
-    @property
-    def completion_percentage(self) -> int:
-        """Процент выполнения (0-100)."""
-        if self.total_items == 0:
-            return 0
-        return int((self.completed_items / self.total_items) * 100)
+    def set_completion_counters(self, total: int, completed: int) -> None:
+        """Записать счётчики выполнения (процент 0-100)."""
+        self.total_items = total
+        self.completed_items = completed
+        self.completion_percentage = completed * 100 // total if total else 0
 
     def __repr__(self) -> str:
         return f"<ChecklistInstance(id={self.id}, name='{self.name}', status='{self.status}')>"
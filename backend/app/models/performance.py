@@ -15,6 +15,7 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -51,6 +52,9 @@ class Performance(Base, AuditMixin):
     """
     
     __tablename__ = "performances"
+    # updated_at возвращается через RETURNING в том же UPDATE, поэтому
+    # после изменения спектакль не нужно перечитывать
+    __mapper_args__ = {"eager_defaults": True}
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     
@@ -84,6 +88,9 @@ class Performance(Base, AuditMixin):
     
     # Изображение (постер)
     poster_path: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    # BLAKE2b содержимого постера: повторная загрузка того же файла
+    # не перезаписывает его
+    poster_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
     
     # Дополнительные данные
     extra_data: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
@@ -106,7 +113,9 @@ class Performance(Base, AuditMixin):
     sections: Mapped[list["PerformanceSection"]] = relationship(
         "PerformanceSection",
         back_populates="performance",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        lazy="selectin",
+        order_by="[PerformanceSection.sort_order, PerformanceSection.id]",
     )
     inventory_items: Mapped[list["PerformanceInventory"]] = relationship(
         "PerformanceInventory",
@@ -207,6 +216,11 @@ class PerformanceSection(Base, AuditMixin):
         "User",
         foreign_keys=[responsible_id]
     )
+
+    # Индексы
+    __table_args__ = (
+        Index('ix_performance_sections_perf_sort', 'performance_id', 'sort_order'),
+    )
     
     def __repr__(self) -> str:
         return f"<PerformanceSection(id={self.id}, type='{self.section_type}')>"
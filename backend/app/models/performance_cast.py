@@ -9,7 +9,7 @@ import uuid
 from enum import Enum as PyEnum
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, Enum, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy import Boolean, Enum, ForeignKey, Index, Integer, String, Text, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -40,6 +40,7 @@ class PerformanceCast(Base, TimestampMixin):
             "performance_id", "user_id", "character_name",
             name="uq_performance_cast_user_character"
         ),
+        Index("ix_performance_cast_perf_id_id", "performance_id", "id"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -91,6 +92,7 @@ class PerformanceCast(Base, TimestampMixin):
     user: Mapped["User"] = relationship(
         "User",
         foreign_keys=[user_id],
+        lazy="selectin",
     )
 
     def __repr__(self) -> str:
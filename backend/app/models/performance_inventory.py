@@ -7,7 +7,7 @@
 import uuid
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy import ForeignKey, Index, Integer, String, Text, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -33,6 +33,7 @@ class PerformanceInventory(Base, TimestampMixin):
             "performance_id", "item_id", "scene_id",
             name="uq_performance_inventory_item_scene"
         ),
+        Index("ix_performance_inventory_perf_id_id", "performance_id", "id"),
     )
 
     # UUID первичный ключ
@@ -80,10 +81,12 @@ class PerformanceInventory(Base, TimestampMixin):
     item: Mapped["InventoryItem"] = relationship(
         "InventoryItem",
         back_populates="performances",
+        lazy="selectin",
     )
     scene: Mapped["PerformanceSection | None"] = relationship(
         "PerformanceSection",
         foreign_keys=[scene_id],
+        lazy="selectin",
     )
 
     def __repr__(self) -> str:
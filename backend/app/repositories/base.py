@@ -5,7 +5,7 @@
 """
 from typing import Any, Generic, TypeVar
 
-from sqlalchemy import Select, func, select
+from sqlalchemy import ColumnElement, Select, exists, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.base import Base
@@ -144,6 +144,39 @@ class BaseRepository(Generic[ModelType]):
             raise ValueError(f"{self._model.__name__} with id {id} not found")
         return await self.update(instance, data)
 
+    async def update_returning(
+        self,
+        id: int,
+        data: dict[str, Any],
+        *criteria: ColumnElement[bool],
+        options: tuple[Any, ...] = (),
+    ) -> ModelType | None:
+        """
+        Обновить запись одним UPDATE ... RETURNING.
+        
+        В отличие от update_by_id, не читает запись до и после
+        обновления: один запрос вместо трёх.
+        
+        Args:
+            id: Первичный ключ
+            data: Словарь с новыми данными
+            *criteria: Дополнительные условия WHERE
+            options: Опции загрузки связей для возвращаемого экземпляра
+            
+        Returns:
+            Обновлённый экземпляр или None, если ни одна строка
+            не подошла под условия
+        """
+        query = (
+            update(self._model)
+            .where(self._model.id == id, *criteria)
+            .values(**data)
+            .returning(self._model)
+            .options(*options)
+        )
+        result = await self._session.execute(query)
+        return result.scalar_one_or_none()
+    
     async def delete(self, instance: ModelType) -> None:
         """
         Удалить запись.
@@ -164,12 +197,11 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             True если запись существует
         """
+        # SELECT EXISTS останавливается на первой найденной строке
         result = await self._session.execute(
-            select(func.count())
-            .select_from(self._model)
-            .where(self._model.id == id)
+            select(exists().where(self._model.id == id))
         )
-        return result.scalar_one() > 0
+        return result.scalar_one()
     
     def _base_query(self) -> Select[tuple[ModelType]]:
         """
@@ -5,11 +5,27 @@
 - PerformanceRepository
 - PerformanceSectionRepository
 """
-from typing import Sequence
+from typing import Any, Sequence
 
-from sqlalchemy import select, func, or_, and_
+from sqlalchemy import (
+    JSON,
+    ColumnElement,
+    RowMapping,
+    String,
+    and_,
+    cast,
+    exists,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import raiseload, selectinload
 
 from app.models.performance import (
     Performance,
@@ -19,6 +35,19 @@ from app.models.performance import (
 )
 from app.repositories.base import BaseRepository
 
+# Стандартные разделы паспорта в порядке отображения
+_DEFAULT_SECTION_TITLES: dict[SectionType, str] = {
+    SectionType.LIGHTING: "Световая партитура",
+    SectionType.SOUND: "Звуковая партитура",
+    SectionType.SCENERY: "Декорации",
+    SectionType.PROPS: "Реквизит",
+    SectionType.COSTUMES: "Костюмы",
+    SectionType.MAKEUP: "Грим и причёски",
+    SectionType.VIDEO: "Видеопроекции",
+    SectionType.EFFECTS: "Спецэффекты",
+    SectionType.OTHER: "Прочее",
+}
+
 
 class PerformanceRepository(BaseRepository[Performance]):
     """Репозиторий для работы со спектаклями."""
@@ -27,15 +56,96 @@ class PerformanceRepository(BaseRepository[Performance]):
         super().__init__(Performance, session)
     
     async def get_with_sections(self, performance_id: int) -> Performance | None:
-        """Получить спектакль с разделами паспорта."""
+        """
+        Получить спектакль с разделами паспорта.
+        
+        Остальные связи (lazy="selectin" в модели) не загружаются:
+        raiseload("*") превращает случайное обращение к ним в ошибку
+        вместо незаметных дополнительных запросов.
+        """
         query = (
             select(Performance)
-            .options(selectinload(Performance.sections))
+            .options(selectinload(Performance.sections), raiseload("*"))
             .where(Performance.id == performance_id)
         )
         result = await self._session.execute(query)
         return result.scalar_one_or_none()
     
+    async def get_status(self, performance_id: int) -> PerformanceStatus | None:
+        """Получить только статус спектакля (None, если спектакля нет)."""
+        result = await self._session.execute(
+            select(Performance.status).where(Performance.id == performance_id)
+        )
+        return result.scalar_one_or_none()
+    
+    async def get_with_sections_row(
+        self,
+        performance_id: int,
+    ) -> RowMapping | None:
+        """
+        Получить спектакль с разделами одной строкой, без ORM-объектов.
+        
+        Разделы собираются на стороне PostgreSQL через json_agg
+        в поле sections; остальные поля названы как в PerformanceResponse.
+        """
+        section = PerformanceSection
+        sections = (
+            select(
+                func.coalesce(
+                    func.json_agg(
+                        aggregate_order_by(
+                            func.json_build_object(
+                                "id", section.id,
+                                "performance_id", section.performance_id,
+                                "section_type", section.section_type,
+                                "title", section.title,
+                                "content", section.content,
+                                "responsible_id", section.responsible_id,
+                                "data", section.data,
+                                "sort_order", section.sort_order,
+                                "created_at", section.created_at,
+                                "updated_at", section.updated_at,
+                            ),
+                            section.sort_order,
+                            section.id,
+                        )
+                    ),
+                    literal_column("'[]'::json"),
+                    type_=JSON,
+                )
+            )
+            .where(section.performance_id == Performance.id)
+            .scalar_subquery()
+        )
+        query = select(
+            *(
+                column.label("metadata") if column.key == "extra_data" else column
+                for column in Performance.__table__.columns
+            ),
+            sections.label("sections"),
+        ).where(Performance.id == performance_id)
+        result = await self._session.execute(query)
+        return result.mappings().one_or_none()
+    
+    async def update_with_sections(
+        self,
+        performance_id: int,
+        data: dict[str, Any],
+        *criteria: ColumnElement[bool],
+    ) -> Performance | None:
+        """
+        Обновить спектакль через UPDATE ... RETURNING.
+        
+        Возвращает спектакль с разделами (как get_with_sections)
+        или None, если строка не найдена или не прошла criteria.
+        """
+        return await self.update_returning(
+            performance_id,
+            data,
+            *criteria,
+            options=(selectinload(Performance.sections), raiseload("*")),
+        )
+    
     async def search(
         self,
         search: str | None = None,
@@ -52,8 +162,9 @@ class PerformanceRepository(BaseRepository[Performance]):
         Returns:
             Кортеж (список спектаклей, общее количество)
         """
-        # Базовый запрос
-        query = select(Performance)
+        # Базовый запрос. Списки сериализуют только скалярные поля:
+        # связи (lazy="selectin" в модели) не загружаются
+        query = select(Performance).options(raiseload("*"))
         count_query = select(func.count(Performance.id))
         
         # Фильтры
@@ -112,6 +223,7 @@ class PerformanceRepository(BaseRepository[Performance]):
         """Получить спектакли по статусу."""
         query = (
             select(Performance)
+            .options(raiseload("*"))
             .where(Performance.status == status)
             .where(Performance.is_active.is_(True))
             .order_by(Performance.title)
@@ -134,43 +246,65 @@ class PerformanceRepository(BaseRepository[Performance]):
         )
     
     async def get_stats(self, theater_id: int | None = None) -> dict:
-        """Получить статистику спектаклей."""
+        """
+        Получить статистику спектаклей.
+        
+        Счётчики по статусам и топ-5 жанров считаются на стороне БД
+        одним запросом (UNION ALL): строки вида (kind, key, count).
+        Общее количество — сумма счётчиков по статусам.
+        """
         base_filter = Performance.is_active.is_(True)
         if theater_id:
             base_filter = and_(base_filter, Performance.theater_id == theater_id)
         
-        # Общее количество
-        total_query = select(func.count(Performance.id)).where(base_filter)
-        total_result = await self._session.execute(total_query)
-        total = total_result.scalar() or 0
-        
-        stats = {"total_performances": total}
+        count = func.count(Performance.id)
         
         # По статусам
-        for status in PerformanceStatus:
-            status_query = (
-                select(func.count(Performance.id))
-                .where(base_filter)
-                .where(Performance.status == status)
+        status_query = (
+            select(
+                literal("status").label("kind"),
+                cast(Performance.status, String).label("key"),
+                count.label("count"),
             )
-            result = await self._session.execute(status_query)
-            stats[status.value] = result.scalar() or 0
+            .where(base_filter)
+            .group_by(Performance.status)
+        )
         
         # Топ жанров
-        genres_query = (
-            select(Performance.genre, func.count(Performance.id).label('count'))
+        genres_subq = (
+            select(Performance.genre, count.label("count"))
             .where(base_filter)
             .where(Performance.genre.isnot(None))
             .group_by(Performance.genre)
-            .order_by(func.count(Performance.id).desc())
+            .order_by(count.desc())
             .limit(5)
+            .subquery()
         )
-        genres_result = await self._session.execute(genres_query)
-        stats["genres"] = [
-            {"genre": row[0], "count": row[1]}
-            for row in genres_result.all()
-        ]
+        genres_query = select(
+            literal("genre").label("kind"),
+            genres_subq.c.genre.label("key"),
+            genres_subq.c.count,
+        )
+        
+        rows = union_all(status_query, genres_query).subquery()
+        result = await self._session.execute(
+            select(rows).order_by(rows.c.kind, rows.c.count.desc())
+        )
+        
+        stats: dict[str, Any] = dict.fromkeys(
+            (status.value for status in PerformanceStatus), 0
+        )
+        genres = []
+        for kind, key, value in result.all():
+            if kind == "status":
+                stats[key] = value
+            else:
+                genres.append({"genre": key, "count": value})
         
+        stats["total_performances"] = sum(
+            stats[status.value] for status in PerformanceStatus
+        )
+        stats["genres"] = genres
         return stats
 
 
@@ -207,6 +341,21 @@ class PerformanceSectionRepository(BaseRepository[PerformanceSection]):
         result = await self._session.execute(query)
         return result.scalar_one_or_none()
     
+    async def has_type(
+        self,
+        performance_id: int,
+        section_type: SectionType,
+    ) -> bool:
+        """Проверить наличие раздела типа (SELECT EXISTS, без загрузки строки)."""
+        query = select(
+            exists().where(
+                PerformanceSection.performance_id == performance_id,
+                PerformanceSection.section_type == section_type,
+            )
+        )
+        result = await self._session.execute(query)
+        return result.scalar_one()
+    
     async def create_default_sections(
         self,
         performance_id: int,
@@ -215,32 +364,24 @@ class PerformanceSectionRepository(BaseRepository[PerformanceSection]):
         """
         Создать стандартные разделы паспорта для спектакля.
         
-        Создаёт разделы всех типов с пустым содержимым.
+        Создаёт разделы всех типов с пустым содержимым одним
+        INSERT ... RETURNING на все строки.
         """
-        section_titles = {
-            SectionType.LIGHTING: "Световая партитура",
-            SectionType.SOUND: "Звуковая партитура",
-            SectionType.SCENERY: "Декорации",
-            SectionType.PROPS: "Реквизит",
-            SectionType.COSTUMES: "Костюмы",
-            SectionType.MAKEUP: "Грим и причёски",
-            SectionType.VIDEO: "Видеопроекции",
-            SectionType.EFFECTS: "Спецэффекты",
-            SectionType.OTHER: "Прочее",
-        }
-        
-        sections = []
-        for idx, (section_type, title) in enumerate(section_titles.items()):
-            section = PerformanceSection(
-                performance_id=performance_id,
-                section_type=section_type,
-                title=title,
-                sort_order=idx,
-                created_by_id=user_id,
-                updated_by_id=user_id,
-            )
-            self._session.add(section)
-            sections.append(section)
-        
-        await self._session.flush()
-        return sections
+        rows = [
+            {
+                "performance_id": performance_id,
+                "section_type": section_type,
+                "title": title,
+                "sort_order": idx,
+                "created_by_id": user_id,
+                "updated_by_id": user_id,
+            }
+            for idx, (section_type, title) in enumerate(_DEFAULT_SECTION_TITLES.items())
+        ]
+        result = await self._session.scalars(
+            insert(PerformanceSection).returning(
+                PerformanceSection, sort_by_parameter_order=True
+            ),
+            rows,
+        )
+        return list(result)
@@ -6,11 +6,11 @@
 - EventParticipantRepository
 """
 from datetime import date, datetime, timedelta
-from typing import Sequence
+from typing import Any, Sequence
 
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import ColumnElement, RowMapping, select, func, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, load_only, raiseload, selectinload
 
 from app.models.schedule import (
     ScheduleEvent,
@@ -21,6 +21,26 @@ from app.models.schedule import (
 from app.models.performance import Performance
 from app.repositories.base import BaseRepository
 
+# От спектакля в ответах нужно только название; его собственные
+# связи (lazy="selectin" в модели) не загружаются
+_PERFORMANCE_TITLE = joinedload(ScheduleEvent.performance).options(
+    load_only(Performance.id, Performance.title),
+    raiseload("*"),
+)
+
+# Связи события, нужные для полного ответа (участники с пользователями)
+_EVENT_RELATIONS = (
+    selectinload(ScheduleEvent.participants).selectinload(EventParticipant.user),
+    _PERFORMANCE_TITLE,
+)
+
+# Связи для списков: число участников и название спектакля
+# (спектакль — many-to-one, подтягивается JOIN'ом в том же запросе)
+_EVENT_LIST_RELATIONS = (
+    selectinload(ScheduleEvent.participants),
+    _PERFORMANCE_TITLE,
+)
+
 
 class ScheduleEventRepository(BaseRepository[ScheduleEvent]):
     """Репозиторий для работы с событиями расписания."""
@@ -32,15 +52,38 @@ class ScheduleEventRepository(BaseRepository[ScheduleEvent]):
         """Получить событие со связями."""
         query = (
             select(ScheduleEvent)
-            .options(
-                selectinload(ScheduleEvent.participants),
-                selectinload(ScheduleEvent.performance),
-            )
+            .options(*_EVENT_RELATIONS)
             .where(ScheduleEvent.id == event_id)
         )
         result = await self._session.execute(query)
         return result.scalar_one_or_none()
     
+    async def get_status(self, event_id: int) -> EventStatus | None:
+        """Получить только статус события (None, если события нет)."""
+        result = await self._session.execute(
+            select(ScheduleEvent.status).where(ScheduleEvent.id == event_id)
+        )
+        return result.scalar_one_or_none()
+    
+    async def update_with_relations(
+        self,
+        event_id: int,
+        data: dict[str, Any],
+        *criteria: ColumnElement[bool],
+    ) -> ScheduleEvent | None:
+        """
+        Обновить событие через UPDATE ... RETURNING.
+        
+        Возвращает событие со связями (как get_with_relations)
+        или None, если строка не найдена или не прошла criteria.
+        """
+        return await self.update_returning(
+            event_id,
+            data,
+            *criteria,
+            options=_EVENT_RELATIONS,
+        )
+    
     async def get_by_date_range(
         self,
         date_from: date,
@@ -75,6 +118,42 @@ class ScheduleEventRepository(BaseRepository[ScheduleEvent]):
         result = await self._session.execute(query)
         return result.scalars().all()
     
+    async def get_calendar_rows(
+        self,
+        date_from: date,
+        date_to: date,
+        theater_id: int | None = None,
+    ) -> Sequence[RowMapping]:
+        """
+        Получить события за период для календаря.
+        
+        Выбираются только поля CalendarEvent (с его именами),
+        без создания ORM-объектов и загрузки связей.
+        """
+        query = (
+            select(
+                ScheduleEvent.id,
+                ScheduleEvent.title,
+                ScheduleEvent.event_type,
+                ScheduleEvent.status,
+                ScheduleEvent.event_date.label("date"),
+                ScheduleEvent.start_time.label("start"),
+                ScheduleEvent.end_time.label("end"),
+                ScheduleEvent.color,
+                ScheduleEvent.performance_id,
+            )
+            .where(ScheduleEvent.is_active.is_(True))
+            .where(ScheduleEvent.event_date >= date_from)
+            .where(ScheduleEvent.event_date <= date_to)
+            .order_by(ScheduleEvent.event_date, ScheduleEvent.start_time)
+        )
+        
+        if theater_id:
+            query = query.where(ScheduleEvent.theater_id == theater_id)
+        
+        result = await self._session.execute(query)
+        return result.mappings().all()
+    
     async def get_by_date(
         self,
         event_date: date,
@@ -97,7 +176,7 @@ class ScheduleEventRepository(BaseRepository[ScheduleEvent]):
         
         query = (
             select(ScheduleEvent)
-            .options(selectinload(ScheduleEvent.performance))
+            .options(*_EVENT_LIST_RELATIONS)
             .where(ScheduleEvent.is_active.is_(True))
             .where(ScheduleEvent.event_date >= today)
             .where(ScheduleEvent.event_date <= end_date)
@@ -127,7 +206,7 @@ class ScheduleEventRepository(BaseRepository[ScheduleEvent]):
         """Поиск событий с фильтрацией."""
         query = (
             select(ScheduleEvent)
-            .options(selectinload(ScheduleEvent.performance))
+            .options(*_EVENT_LIST_RELATIONS)
         )
         count_query = select(func.count(ScheduleEvent.id))
         
@@ -181,49 +260,53 @@ class ScheduleEventRepository(BaseRepository[ScheduleEvent]):
         return events, total
     
     async def get_stats(self, theater_id: int | None = None) -> dict:
-        """Получить статистику расписания."""
+        """
+        Получить статистику расписания.
+        
+        Все счётчики считаются одним запросом (агрегаты с FILTER).
+        """
         base_filter = ScheduleEvent.is_active.is_(True)
         if theater_id:
             base_filter = and_(base_filter, ScheduleEvent.theater_id == theater_id)
         
-        stats = {}
-        
-        # Общее количество
-        total_query = select(func.count(ScheduleEvent.id)).where(base_filter)
-        total_result = await self._session.execute(total_query)
-        stats["total_events"] = total_result.scalar() or 0
-        
-        # По статусам
-        for status in [EventStatus.PLANNED, EventStatus.CONFIRMED, EventStatus.COMPLETED, EventStatus.CANCELLED]:
-            status_query = (
-                select(func.count(ScheduleEvent.id))
-                .where(base_filter)
-                .where(ScheduleEvent.status == status)
-            )
-            result = await self._session.execute(status_query)
-            stats[status.value] = result.scalar() or 0
-        
-        # По типам
-        perf_query = (
-            select(func.count(ScheduleEvent.id))
-            .where(base_filter)
-            .where(ScheduleEvent.event_type == EventType.PERFORMANCE)
-        )
-        perf_result = await self._session.execute(perf_query)
-        stats["performances_count"] = perf_result.scalar() or 0
-        
         rehearsal_types = [
             EventType.REHEARSAL,
             EventType.TECH_REHEARSAL,
             EventType.DRESS_REHEARSAL,
         ]
-        reh_query = (
-            select(func.count(ScheduleEvent.id))
-            .where(base_filter)
-            .where(ScheduleEvent.event_type.in_(rehearsal_types))
-        )
-        reh_result = await self._session.execute(reh_query)
-        stats["rehearsals_count"] = reh_result.scalar() or 0
+        statuses = [
+            EventStatus.PLANNED,
+            EventStatus.CONFIRMED,
+            EventStatus.COMPLETED,
+            EventStatus.CANCELLED,
+        ]
+        today = date.today()
+        
+        query = select(
+            func.count(ScheduleEvent.id).label("total_events"),
+            *(
+                func.count(ScheduleEvent.id)
+                .filter(ScheduleEvent.status == status)
+                .label(status.value)
+                for status in statuses
+            ),
+            func.count(ScheduleEvent.id)
+            .filter(ScheduleEvent.event_type == EventType.PERFORMANCE)
+            .label("performances_count"),
+            func.count(ScheduleEvent.id)
+            .filter(ScheduleEvent.event_type.in_(rehearsal_types))
+            .label("rehearsals_count"),
+            # Предстоящие события
+            func.count(ScheduleEvent.id)
+            .filter(
+                ScheduleEvent.event_date >= today,
+                ScheduleEvent.status.in_([EventStatus.PLANNED, EventStatus.CONFIRMED]),
+            )
+            .label("upcoming_events"),
+        ).where(base_filter)
+        
+        result = await self._session.execute(query)
+        stats = dict(result.mappings().one())
         
         stats["other_count"] = (
             stats["total_events"] 
@@ -231,17 +314,6 @@ class ScheduleEventRepository(BaseRepository[ScheduleEvent]):
             - stats["rehearsals_count"]
         )
         
-        # Предстоящие события
-        today = date.today()
-        upcoming_query = (
-            select(func.count(ScheduleEvent.id))
-            .where(base_filter)
-            .where(ScheduleEvent.event_date >= today)
-            .where(ScheduleEvent.status.in_([EventStatus.PLANNED, EventStatus.CONFIRMED]))
-        )
-        upcoming_result = await self._session.execute(upcoming_query)
-        stats["upcoming_events"] = upcoming_result.scalar() or 0
-        
         return stats
 
 
@@ -261,6 +333,35 @@ class EventParticipantRepository(BaseRepository[EventParticipant]):
         result = await self._session.execute(query)
         return result.scalars().all()
     
+    async def get_with_user(self, participant_id: int) -> EventParticipant | None:
+        """Получить участника с пользователем."""
+        query = (
+            select(EventParticipant)
+            .options(selectinload(EventParticipant.user))
+            .where(EventParticipant.id == participant_id)
+        )
+        result = await self._session.execute(query)
+        return result.scalar_one_or_none()
+    
+    async def update_with_user(
+        self,
+        participant_id: int,
+        data: dict[str, Any],
+        *criteria: ColumnElement[bool],
+    ) -> EventParticipant | None:
+        """
+        Обновить участника через UPDATE ... RETURNING.
+        
+        Возвращает участника с пользователем или None,
+        если строка не найдена или не прошла criteria.
+        """
+        return await self.update_returning(
+            participant_id,
+            data,
+            *criteria,
+            options=(selectinload(EventParticipant.user),),
+        )
+    
     async def get_by_user_and_event(
         self,
         user_id: int,
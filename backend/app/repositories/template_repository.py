@@ -4,8 +4,10 @@
 from typing import Any
 
 from sqlalchemy import Select, func, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.models.document_template import (
     DocumentTemplate,
@@ -41,6 +43,29 @@ class TemplateRepository(BaseRepository[DocumentTemplate]):
         )
         return result.scalar_one_or_none()
 
+    def _apply_filters(
+        self,
+        query: Select,
+        *,
+        theater_id: int | None = None,
+        template_type: TemplateType | None = None,
+        is_active: bool | None = None,
+    ) -> Select:
+        """Применить фильтры списка шаблонов к запросу."""
+        if theater_id is not None:
+            query = query.where(
+                (self._model.theater_id == theater_id) |
+                (self._model.theater_id.is_(None))  # Системные шаблоны для всех
+            )
+
+        if template_type is not None:
+            query = query.where(self._model.template_type == template_type)
+
+        if is_active is not None:
+            query = query.where(self._model.is_active == is_active)
+
+        return query
+
     async def get_all(
         self,
         *,
@@ -60,25 +85,59 @@ class TemplateRepository(BaseRepository[DocumentTemplate]):
             template_type: Фильтр по типу
             is_active: Фильтр по активности
         """
-        query = self._base_query()
-
-        if theater_id is not None:
-            query = query.where(
-                (self._model.theater_id == theater_id) |
-                (self._model.theater_id.is_(None))  # Системные шаблоны для всех
-            )
+        templates, _ = await self.get_page(
+            skip=skip,
+            limit=limit,
+            theater_id=theater_id,
+            template_type=template_type,
+            is_active=is_active,
+        )
+        return templates
 
-        if template_type is not None:
-            query = query.where(self._model.template_type == template_type)
+    async def get_page(
+        self,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        theater_id: int | None = None,
+        template_type: TemplateType | None = None,
+        is_active: bool | None = None,
+    ) -> tuple[list[DocumentTemplate], int]:
+        """
+        Получить страницу шаблонов и общее количество одним запросом.
 
-        if is_active is not None:
-            query = query.where(self._model.is_active == is_active)
+        Общее количество считается оконной функцией count(*) OVER ()
+        по отфильтрованной выборке до OFFSET/LIMIT.
 
+        Returns:
+            Кортеж (список шаблонов, общее количество)
+        """
+        query = self._apply_filters(
+            select(self._model, func.count().over().label("total")).options(
+                selectinload(DocumentTemplate.variables)
+            ),
+            theater_id=theater_id,
+            template_type=template_type,
+            is_active=is_active,
+        )
         query = query.order_by(self._model.template_type, self._model.name)
         query = query.offset(skip).limit(limit)
 
         result = await self._session.execute(query)
-        return list(result.scalars().all())
+        rows = result.all()
+        if rows:
+            return [row[0] for row in rows], rows[0].total
+
+        # Пустая страница: за пределами выборки общее количество
+        # из окна не получить, считаем отдельно
+        if skip == 0:
+            return [], 0
+        total = await self.count(
+            theater_id=theater_id,
+            template_type=template_type,
+            is_active=is_active,
+        )
+        return [], total
 
     async def count(
         self,
@@ -88,19 +147,12 @@ class TemplateRepository(BaseRepository[DocumentTemplate]):
         is_active: bool | None = None,
     ) -> int:
         """Подсчёт шаблонов с фильтрацией."""
-        query = select(func.count()).select_from(self._model)
-
-        if theater_id is not None:
-            query = query.where(
-                (self._model.theater_id == theater_id) |
-                (self._model.theater_id.is_(None))
-            )
-
-        if template_type is not None:
-            query = query.where(self._model.template_type == template_type)
-
-        if is_active is not None:
-            query = query.where(self._model.is_active == is_active)
+        query = self._apply_filters(
+            select(func.count()).select_from(self._model),
+            theater_id=theater_id,
+            template_type=template_type,
+            is_active=is_active,
+        )
 
         result = await self._session.execute(query)
         return result.scalar_one()
@@ -117,6 +169,32 @@ class TemplateRepository(BaseRepository[DocumentTemplate]):
         result = await self._session.execute(query)
         return result.scalar_one() > 0
 
+    async def create_if_code_free(
+        self, data: dict[str, Any]
+    ) -> DocumentTemplate | None:
+        """
+        Создать шаблон, если код ещё не занят.
+
+        INSERT ... ON CONFLICT (code) DO NOTHING RETURNING: запрос,
+        проигравший гонку за код после проверки code_exists, получает
+        None вместо IntegrityError.
+
+        Returns:
+            Созданный шаблон (без переменных) или None, если код занят
+        """
+        query = (
+            insert(self._model)
+            .values(**data)
+            .on_conflict_do_nothing(index_elements=[self._model.code])
+            .returning(self._model)
+        )
+        result = await self._session.execute(query)
+        template = result.scalar_one_or_none()
+        if template is not None:
+            # Новый шаблон ещё без переменных — не нужен отдельный SELECT
+            set_committed_value(template, "variables", [])
+        return template
+
 
 class TemplateVariableRepository(BaseRepository[DocumentTemplateVariable]):
     """Репозиторий для переменных шаблонов."""
@@ -155,20 +233,22 @@ class TemplateVariableRepository(BaseRepository[DocumentTemplateVariable]):
         template_id: int,
         variables_data: list[dict[str, Any]],
     ) -> list[DocumentTemplateVariable]:
-        """Массовое создание переменных."""
-        variables = []
-        for data in variables_data:
-            data['template_id'] = template_id
-            variable = DocumentTemplateVariable(**data)
-            self._session.add(variable)
-            variables.append(variable)
-
-        await self._session.flush()
-
-        for var in variables:
-            await self._session.refresh(var)
+        """
+        Массовое создание переменных.
 
-        return variables
+        Один INSERT ... RETURNING на все строки вместо add + refresh
+        для каждой переменной.
+        """
+        if not variables_data:
+            return []
+        rows = [{**data, "template_id": template_id} for data in variables_data]
+        result = await self._session.scalars(
+            insert(self._model).returning(
+                self._model, sort_by_parameter_order=True
+            ),
+            rows,
+        )
+        return list(result)
 
     async def delete_by_template_id(self, template_id: int) -> int:
         """Удалить все переменные шаблона."""
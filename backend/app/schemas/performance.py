@@ -251,6 +251,9 @@ class PerformanceInventoryResponse(BaseModel):
 
 from uuid import UUID
 
+from app.schemas.checklist_hub import ChecklistStatus, ChecklistType
+from app.schemas.performance_cast import PerformanceCastListResponse
+
 
 class PerformanceInventoryLinkCreate(BaseModel):
     """Схема создания связи инвентаря со спектаклем (Performance Hub)."""
@@ -308,6 +311,27 @@ class PerformanceSnapshotResponse(BaseModel):
     description: str | None = None
 
 
+class PerformanceStructureSection(BaseModel):
+    """Раздел в структуре спектакля (облегчённый)."""
+
+    id: int
+    section_type: SectionType
+    title: str
+    content: str | None = None
+    sort_order: int
+
+
+class PerformanceStructureChecklist(BaseModel):
+    """Экземпляр чеклиста в структуре спектакля (облегчённый)."""
+
+    id: UUID
+    name: str
+    status: ChecklistStatus
+    completion_percentage: int
+    template_name: str | None = None
+    template_type: ChecklistType | None = None
+
+
 class PerformanceStructureResponse(BaseModel):
     """Полная структура спектакля для Performance Hub."""
 
@@ -319,15 +343,15 @@ class PerformanceStructureResponse(BaseModel):
     is_template: bool
 
     # Разделы/сцены
-    sections: list[SectionResponse] = []
+    sections: list[PerformanceStructureSection] = []
 
     # Привязанный инвентарь
     inventory_items: list[PerformanceInventoryLinkResponse] = []
 
-    # Каст и персонал (будет добавлен после создания cast schemas)
-    # cast_crew: list[PerformanceCastResponse] = []
+    # Каст и персонал
+    cast_crew: list[PerformanceCastListResponse] = []
 
-    # Чеклисты (будет добавлен после создания checklist schemas)
-    # checklist_instances: list[ChecklistInstanceResponse] = []
+    # Чеклисты
+    checklist_instances: list[PerformanceStructureChecklist] = []
 
     model_config = ConfigDict(from_attributes=True)
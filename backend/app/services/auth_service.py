@@ -175,11 +175,7 @@ class AuthService:
             user_id: ID пользователя
             access_token: Текущий access token
         """
-        # Удаляем refresh token
-        await self._redis.delete_refresh_token(user_id)
-        
-        # Добавляем access token в blacklist
-        await self._redis.blacklist_token(access_token)
+        await self._redis.logout(user_id, access_token)
     
     async def get_user_by_id(self, user_id: int) -> User | None:
         """
@@ -8,14 +8,19 @@
 - Каст и персонал
 - Версионирование (снапшоты)
 """
+import time
 import uuid
+from collections.abc import AsyncIterator
 from datetime import datetime
+from itertools import groupby
+from operator import attrgetter
 from typing import Any
 
-from sqlalchemy import select, and_, func
+from sqlalchemy import and_, delete, exists, func, insert, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import raiseload, selectinload
 
+from app.database.session import call_after_commit
 from app.models import (
     Performance,
     PerformanceSection,
@@ -45,15 +50,78 @@ from app.schemas.checklist_hub import (
     ChecklistItemUpdate,
 )
 from app.schemas.performance_cast import (
+    CastRoleType as CastRoleTypeSchema,
     PerformanceCastCreate,
     PerformanceCastUpdate,
     PerformanceCastResponse,
+    PerformanceCastListResponse,
     PerformanceCastGroupedResponse,
 )
 
 
+# Кэш шаблонов чеклистов: theater_id -> (время записи, список шаблонов).
+# Шаблоны читаются часто, а меняются редко; TTL ограничивает
+# рассинхронизацию между воркерами.
+_TEMPLATES_CACHE_TTL = 60.0
+_templates_cache: dict[int | None, tuple[float, list[ChecklistTemplateResponse]]] = {}
+
+# Ответы собираются через model_construct() из данных БД, поэтому enum
+# модели заранее сопоставлен с enum схемы (валидация не выполняется)
+_CAST_ROLE_TYPES = {m: CastRoleTypeSchema(m.value) for m in CastRoleType}
+_cast_role_type = attrgetter("role_type")
+_cast_list_fields = attrgetter(
+    "id", "user_id", "role_type", "character_name", "functional_role", "is_understudy"
+)
+
+# Размер страницы при потоковой выгрузке
+_STREAM_PARTITION_SIZE = 500
+
+# Загрузка связанных данных для ответов; raiseload("*") запрещает
+# неявные ленивые запросы
+_INVENTORY_LINK_OPTIONS = (
+    selectinload(PerformanceInventory.item).selectinload(InventoryItem.category),
+    selectinload(PerformanceInventory.scene),
+    raiseload("*"),
+)
+# Отдел пользователя нужен для user_department в PerformanceCastResponse
+_CAST_MEMBER_OPTIONS = (
+    selectinload(PerformanceCast.user).selectinload(User.department),
+    raiseload("*"),
+)
+
+# Базовые запросы собираются один раз при импорте; методы лишь добавляют
+# условия (.where()/.order_by() возвращают копию, исходник не меняется)
+_PERF_STRUCTURE_STMT = select(Performance).options(
+    selectinload(Performance.sections),
+    selectinload(Performance.inventory_items)
+    .selectinload(PerformanceInventory.item)
+    .selectinload(InventoryItem.category),
+    selectinload(Performance.inventory_items).selectinload(
+        PerformanceInventory.scene
+    ),
+    selectinload(Performance.cast_crew).selectinload(PerformanceCast.user),
+    selectinload(Performance.checklist_instances).selectinload(
+        ChecklistInstance.template
+    ),
+    raiseload("*"),
+)
+_INVENTORY_LINK_STMT = select(PerformanceInventory).options(*_INVENTORY_LINK_OPTIONS)
+_CAST_MEMBER_STMT = select(PerformanceCast).options(*_CAST_MEMBER_OPTIONS)
+# У шаблона связь instances объявлена lazy="selectin" — без raiseload
+# вместе с шаблоном подтягивались бы все его экземпляры
+_CHECKLIST_INSTANCE_STMT = select(ChecklistInstance).options(
+    selectinload(ChecklistInstance.template).raiseload("*"), raiseload("*")
+)
+
+
 class PerformanceHubService:
-    """Сервис для работы с Performance Hub."""
+    """
+    Сервис для работы с Performance Hub.
+
+    Сервис не фиксирует транзакцию сам: изменения отправляются в БД
+    через flush(), а единственный commit (или rollback при ошибке)
+    выполняет зависимость get_session по завершении запроса.
+    """
 
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -64,27 +132,9 @@ class PerformanceHubService:
 
     async def get_performance_structure(
         self, performance_id: int
-    ) -> dict[str, Any]:
+    ) -> dict[str, Any] | None:
         """Получить полную структуру спектакля."""
-        query = (
-            select(Performance)
-            .options(
-                selectinload(Performance.sections),
-                selectinload(Performance.inventory_items).selectinload(
-                    PerformanceInventory.item
-                ),
-                selectinload(Performance.inventory_items).selectinload(
-                    PerformanceInventory.scene
-                ),
-                selectinload(Performance.cast_crew).selectinload(
-                    PerformanceCast.user
-                ),
-                selectinload(Performance.checklist_instances).selectinload(
-                    ChecklistInstance.template
-                ),
-            )
-            .where(Performance.id == performance_id)
-        )
+        query = _PERF_STRUCTURE_STMT.where(Performance.id == performance_id)
         result = await self.session.execute(query)
         performance = result.scalar_one_or_none()
 
@@ -107,7 +157,7 @@ class PerformanceHubService:
                     "content": s.content,
                     "sort_order": s.sort_order,
                 }
-                for s in sorted(performance.sections, key=lambda x: x.sort_order)
+                for s in performance.sections
             ],
             "inventory_items": [
                 {
@@ -117,8 +167,9 @@ class PerformanceHubService:
                     "scene_id": inv.scene_id,
                     "quantity": inv.quantity,
                     "notes": inv.notes,
-                    "created_at": inv.created_at.isoformat() if inv.created_at else None,
-                    "updated_at": inv.updated_at.isoformat() if inv.updated_at else None,
+                    # datetime сериализует pydantic-core через response_model
+                    "created_at": inv.created_at,
+                    "updated_at": inv.updated_at,
                     "item_name": inv.item.name if inv.item else None,
                     "item_inventory_number": inv.item.inventory_number if inv.item else None,
                     "item_category": inv.item.category.name if inv.item and inv.item.category else None,
@@ -153,6 +204,14 @@ class PerformanceHubService:
 
         return structure
 
+    async def performance_exists(self, performance_id: int) -> bool:
+        """Проверить, что спектакль существует."""
+        return bool(
+            await self.session.scalar(
+                select(exists().where(Performance.id == performance_id))
+            )
+        )
+
     async def create_snapshot(
         self, performance_id: int, description: str | None = None
     ) -> PerformanceSnapshotResponse:
@@ -166,8 +225,7 @@ class PerformanceHubService:
 
         # Увеличиваем версию
         performance.configuration_version += 1
-        await self.session.commit()
-        await self.session.refresh(performance)
+        await self.session.flush()
 
         return PerformanceSnapshotResponse(
             performance_id=performance.id,
@@ -184,25 +242,19 @@ class PerformanceHubService:
         self, performance_id: int, data: PerformanceInventoryLinkCreate
     ) -> PerformanceInventoryLinkResponse:
         """Добавить связь инвентаря со спектаклем."""
-        link = PerformanceInventory(
-            performance_id=performance_id,
-            item_id=data.item_id,
-            scene_id=data.scene_id,
-            quantity=data.quantity,
-            notes=data.notes,
-        )
-        self.session.add(link)
-        await self.session.commit()
-        await self.session.refresh(link)
-
-        # Загружаем связанные данные
+        # INSERT ... RETURNING сразу отдаёт серверные значения
+        # (created_at/updated_at) и подгружает связанные данные
         query = (
-            select(PerformanceInventory)
-            .options(
-                selectinload(PerformanceInventory.item),
-                selectinload(PerformanceInventory.scene),
+            insert(PerformanceInventory)
+            .values(
+                performance_id=performance_id,
+                item_id=data.item_id,
+                scene_id=data.scene_id,
+                quantity=data.quantity,
+                notes=data.notes,
             )
-            .where(PerformanceInventory.id == link.id)
+            .returning(PerformanceInventory)
+            .options(*_INVENTORY_LINK_OPTIONS)
         )
         result = await self.session.execute(query)
         link = result.scalar_one()
@@ -216,17 +268,10 @@ class PerformanceHubService:
         data: PerformanceInventoryLinkUpdate,
     ) -> PerformanceInventoryLinkResponse:
         """Обновить связь инвентаря."""
-        query = (
-            select(PerformanceInventory)
-            .options(
-                selectinload(PerformanceInventory.item),
-                selectinload(PerformanceInventory.scene),
-            )
-            .where(
-                and_(
-                    PerformanceInventory.id == link_id,
-                    PerformanceInventory.performance_id == performance_id,
-                )
+        query = _INVENTORY_LINK_STMT.where(
+            and_(
+                PerformanceInventory.id == link_id,
+                PerformanceInventory.performance_id == performance_id,
             )
         )
         result = await self.session.execute(query)
@@ -242,7 +287,7 @@ class PerformanceHubService:
         if data.scene_id is not None:
             link.scene_id = data.scene_id
 
-        await self.session.commit()
+        await self.session.flush()
         await self.session.refresh(link)
 
         return self._map_inventory_link(link)
@@ -251,27 +296,54 @@ class PerformanceHubService:
         self, performance_id: int, link_id: uuid.UUID
     ) -> bool:
         """Удалить связь инвентаря."""
-        query = select(PerformanceInventory).where(
-            and_(
-                PerformanceInventory.id == link_id,
-                PerformanceInventory.performance_id == performance_id,
+        query = (
+            delete(PerformanceInventory)
+            .where(
+                and_(
+                    PerformanceInventory.id == link_id,
+                    PerformanceInventory.performance_id == performance_id,
+                )
             )
+            .returning(PerformanceInventory.id)
         )
         result = await self.session.execute(query)
-        link = result.scalar_one_or_none()
-
-        if not link:
-            return False
+        deleted = result.first() is not None
+        return deleted
 
-        await self.session.delete(link)
-        await self.session.commit()
-        return True
+    async def stream_inventory_links(
+        self, performance_id: int
+    ) -> AsyncIterator[list[PerformanceInventoryLinkResponse]]:
+        """
+        Постранично выбрать связи инвентаря спектакля.
+
+        Страницы по _STREAM_PARTITION_SIZE читаются по ключу (id > последний),
+        после каждой транзакция завершается и соединение возвращается
+        в пул: медленный клиент не удерживает соединение и курсор.
+        Память ограничена размером страницы, а не числом связей.
+        """
+        base = (
+            _INVENTORY_LINK_STMT
+            .where(PerformanceInventory.performance_id == performance_id)
+            .order_by(PerformanceInventory.id)
+            .limit(_STREAM_PARTITION_SIZE)
+        )
+        query = base
+        while True:
+            links = (await self.session.scalars(query)).all()
+            page = [self._map_inventory_link(link) for link in links]
+            await self.session.rollback()
+            if not page:
+                return
+            yield page
+            if len(page) < _STREAM_PARTITION_SIZE:
+                return
+            query = base.where(PerformanceInventory.id > page[-1].id)
 
     def _map_inventory_link(
         self, link: PerformanceInventory
     ) -> PerformanceInventoryLinkResponse:
         """Преобразовать модель в схему ответа."""
-        return PerformanceInventoryLinkResponse(
+        return PerformanceInventoryLinkResponse.model_construct(
             id=link.id,
             performance_id=link.performance_id,
             item_id=link.item_id,
@@ -295,6 +367,11 @@ class PerformanceHubService:
         self, theater_id: int | None = None
     ) -> list[ChecklistTemplateResponse]:
         """Получить список шаблонов чеклистов."""
+        cached = _templates_cache.get(theater_id)
+        if cached and time.monotonic() - cached[0] < _TEMPLATES_CACHE_TTL:
+            # Копии: вызывающий код не должен менять закэшированные модели
+            return [t.model_copy(deep=True) for t in cached[1]]
+
         query = select(ChecklistTemplate).where(ChecklistTemplate.is_active == True)
         if theater_id:
             query = query.where(
@@ -304,7 +381,7 @@ class PerformanceHubService:
         result = await self.session.execute(query)
         templates = result.scalars().all()
 
-        return [
+        response = [
             ChecklistTemplateResponse(
                 id=t.id,
                 name=t.name,
@@ -318,21 +395,30 @@ class PerformanceHubService:
             )
             for t in templates
         ]
+        _templates_cache[theater_id] = (time.monotonic(), response)
+        return [t.model_copy(deep=True) for t in response]
 
     async def create_checklist_template(
         self, data: ChecklistTemplateCreate, theater_id: int | None = None
     ) -> ChecklistTemplateResponse:
         """Создать шаблон чеклиста."""
-        template = ChecklistTemplate(
-            name=data.name,
-            description=data.description,
-            type=data.type,
-            items=[item.model_dump() for item in data.items],
-            theater_id=theater_id,
+        query = (
+            insert(ChecklistTemplate)
+            .values(
+                name=data.name,
+                description=data.description,
+                type=data.type,
+                items=[item.model_dump() for item in data.items],
+                theater_id=theater_id,
+            )
+            .returning(ChecklistTemplate)
+            .options(raiseload("*"))
         )
-        self.session.add(template)
-        await self.session.commit()
-        await self.session.refresh(template)
+        result = await self.session.execute(query)
+        template = result.scalar_one()
+        # Общие шаблоны (theater_id=None) видны всем театрам. Сброс после
+        # commit: иначе параллельный запрос закэширует список без нового шаблона
+        call_after_commit(self.session, _templates_cache.clear)
 
         return ChecklistTemplateResponse(
             id=template.id,
@@ -371,16 +457,23 @@ class PerformanceHubService:
 
         name = data.name or (template.name if template else "Custom Checklist")
 
-        instance = ChecklistInstance(
-            performance_id=performance_id,
-            template_id=data.template_id,
-            name=name,
-            status=ChecklistStatus.PENDING,
-            completion_data={"items": items},
+        query = (
+            insert(ChecklistInstance)
+            .values(
+                performance_id=performance_id,
+                template_id=data.template_id,
+                name=name,
+                status=ChecklistStatus.PENDING,
+                completion_data={"items": items},
+                total_items=len(items),
+                completed_items=0,
+                completion_percentage=0,
+            )
+            .returning(ChecklistInstance)
+            .options(raiseload("*"))
         )
-        self.session.add(instance)
-        await self.session.commit()
-        await self.session.refresh(instance)
+        result = await self.session.execute(query)
+        instance = result.scalar_one()
 
         return self._map_checklist_instance(instance, template)
 
@@ -392,11 +485,7 @@ class PerformanceHubService:
         user_id: int,
     ) -> ChecklistInstanceResponse:
         """Обновить статус элемента чеклиста."""
-        query = (
-            select(ChecklistInstance)
-            .options(selectinload(ChecklistInstance.template))
-            .where(ChecklistInstance.id == instance_id)
-        )
+        query = _CHECKLIST_INSTANCE_STMT.where(ChecklistInstance.id == instance_id)
         result = await self.session.execute(query)
         instance = result.scalar_one_or_none()
 
@@ -428,7 +517,8 @@ class PerformanceHubService:
             instance.status = ChecklistStatus.IN_PROGRESS
 
         instance.completion_data = {"items": items}
-        await self.session.commit()
+        instance.set_completion_counters(total, completed)
+        await self.session.flush()
         await self.session.refresh(instance)
 
         return self._map_checklist_instance(instance, instance.template)
@@ -462,32 +552,21 @@ class PerformanceHubService:
     ) -> PerformanceCastGroupedResponse:
         """Получить каст и персонал спектакля."""
         query = (
-            select(PerformanceCast)
-            .options(selectinload(PerformanceCast.user))
+            _CAST_MEMBER_STMT
             .where(PerformanceCast.performance_id == performance_id)
+            .order_by(PerformanceCast.role_type)
         )
         result = await self.session.execute(query)
-        members = result.scalars().all()
-
-        cast = []
-        crew = []
-
-        for m in members:
-            item = {
-                "id": m.id,
-                "user_id": m.user_id,
-                "user_full_name": m.user.full_name if m.user else None,
-                "role_type": m.role_type,
-                "character_name": m.character_name,
-                "functional_role": m.functional_role,
-                "is_understudy": m.is_understudy,
-            }
-            if m.role_type == CastRoleType.CAST:
-                cast.append(item)
-            else:
-                crew.append(item)
-
-        return PerformanceCastGroupedResponse(
+
+        # Строки отсортированы по role_type — делим на группы за один проход
+        grouped: dict[CastRoleType, list[PerformanceCastListResponse]] = {}
+        for role_type, members in groupby(result.scalars(), key=_cast_role_type):
+            grouped[role_type] = [self._map_cast_list_item(m) for m in members]
+
+        cast = grouped.get(CastRoleType.CAST, [])
+        crew = grouped.get(CastRoleType.CREW, [])
+
+        return PerformanceCastGroupedResponse.model_construct(
             performance_id=performance_id,
             cast=cast,
             crew=crew,
@@ -499,24 +578,19 @@ class PerformanceHubService:
         self, performance_id: int, data: PerformanceCastCreate
     ) -> PerformanceCastResponse:
         """Добавить участника к спектаклю."""
-        member = PerformanceCast(
-            performance_id=performance_id,
-            user_id=data.user_id,
-            role_type=data.role_type,
-            character_name=data.character_name,
-            functional_role=data.functional_role,
-            is_understudy=data.is_understudy,
-            notes=data.notes,
-        )
-        self.session.add(member)
-        await self.session.commit()
-        await self.session.refresh(member)
-
-        # Загружаем пользователя
         query = (
-            select(PerformanceCast)
-            .options(selectinload(PerformanceCast.user))
-            .where(PerformanceCast.id == member.id)
+            insert(PerformanceCast)
+            .values(
+                performance_id=performance_id,
+                user_id=data.user_id,
+                role_type=data.role_type,
+                character_name=data.character_name,
+                functional_role=data.functional_role,
+                is_understudy=data.is_understudy,
+                notes=data.notes,
+            )
+            .returning(PerformanceCast)
+            .options(*_CAST_MEMBER_OPTIONS)
         )
         result = await self.session.execute(query)
         member = result.scalar_one()
@@ -530,14 +604,10 @@ class PerformanceHubService:
         data: PerformanceCastUpdate,
     ) -> PerformanceCastResponse:
         """Обновить информацию об участнике."""
-        query = (
-            select(PerformanceCast)
-            .options(selectinload(PerformanceCast.user))
-            .where(
-                and_(
-                    PerformanceCast.id == member_id,
-                    PerformanceCast.performance_id == performance_id,
-                )
+        query = _CAST_MEMBER_STMT.where(
+            and_(
+                PerformanceCast.id == member_id,
+                PerformanceCast.performance_id == performance_id,
             )
         )
         result = await self.session.execute(query)
@@ -555,7 +625,7 @@ class PerformanceHubService:
         if data.notes is not None:
             member.notes = data.notes
 
-        await self.session.commit()
+        await self.session.flush()
         await self.session.refresh(member)
 
         return self._map_cast_member(member)
@@ -564,29 +634,82 @@ class PerformanceHubService:
         self, performance_id: int, member_id: uuid.UUID
     ) -> bool:
         """Удалить участника из спектакля."""
-        query = select(PerformanceCast).where(
-            and_(
-                PerformanceCast.id == member_id,
-                PerformanceCast.performance_id == performance_id,
+        query = (
+            delete(PerformanceCast)
+            .where(
+                and_(
+                    PerformanceCast.id == member_id,
+                    PerformanceCast.performance_id == performance_id,
+                )
             )
+            .returning(PerformanceCast.id)
         )
         result = await self.session.execute(query)
-        member = result.scalar_one_or_none()
-
-        if not member:
-            return False
+        deleted = result.first() is not None
+        return deleted
+
+    def _map_cast_list_item(
+        self, member: PerformanceCast
+    ) -> PerformanceCastListResponse:
+        """Преобразовать модель в облегчённую схему для списка."""
+        (
+            member_id,
+            user_id,
+            role_type,
+            character_name,
+            functional_role,
+            is_understudy,
+        ) = _cast_list_fields(member)
+        return PerformanceCastListResponse.model_construct(
+            id=member_id,
+            user_id=user_id,
+            user_full_name=member.user.full_name if member.user else None,
+            role_type=_CAST_ROLE_TYPES[role_type],
+            character_name=character_name,
+            functional_role=functional_role,
+            is_understudy=is_understudy,
+        )
 
-        await self.session.delete(member)
-        await self.session.commit()
-        return True
+    async def stream_cast_members(
+        self, performance_id: int
+    ) -> AsyncIterator[list[PerformanceCastResponse]]:
+        """
+        Постранично выбрать участников спектакля.
+
+        Аналог stream_inventory_links() для каста и персонала;
+        ключ страницы — (role_type, id), как и порядок сортировки.
+        """
+        base = (
+            _CAST_MEMBER_STMT
+            .where(PerformanceCast.performance_id == performance_id)
+            .order_by(PerformanceCast.role_type, PerformanceCast.id)
+            .limit(_STREAM_PARTITION_SIZE)
+        )
+        query = base
+        while True:
+            members = (await self.session.scalars(query)).all()
+            page = [self._map_cast_member(member) for member in members]
+            if members:
+                # Ключ берётся до rollback: откат сбрасывает состояние объектов
+                last_key = (members[-1].role_type, members[-1].id)
+            await self.session.rollback()
+            if not page:
+                return
+            yield page
+            if len(page) < _STREAM_PARTITION_SIZE:
+                return
+            query = base.where(
+                tuple_(PerformanceCast.role_type, PerformanceCast.id)
+                > tuple_(*last_key)
+            )
 
     def _map_cast_member(self, member: PerformanceCast) -> PerformanceCastResponse:
         """Преобразовать модель в схему ответа."""
-        return PerformanceCastResponse(
+        return PerformanceCastResponse.model_construct(
             id=member.id,
             performance_id=member.performance_id,
             user_id=member.user_id,
-            role_type=member.role_type,
+            role_type=_CAST_ROLE_TYPES[member.role_type],
             character_name=member.character_name,
             functional_role=member.functional_role,
             is_understudy=member.is_understudy,
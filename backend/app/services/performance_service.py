@@ -6,13 +6,26 @@
 - Управление паспортом спектакля
 - Статистика
 """
+import hashlib
+import time
+import uuid
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from functools import lru_cache
 from pathlib import Path
 
+import aiofiles
 from fastapi import UploadFile
+from sqlalchemy import func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.config import settings
 from app.core.exceptions import NotFoundError, ValidationError
+from app.database.session import call_after_commit
+from app.models.checklist import ChecklistItem, PerformanceChecklist
 from app.models.performance import (
     Performance,
     PerformanceSection,
@@ -25,26 +38,74 @@ from app.repositories.performance_repository import (
 )
 from app.schemas.performance import (
     PerformanceCreate,
+    PerformanceResponse,
     PerformanceUpdate,
     SectionCreate,
     SectionUpdate,
     PerformanceStats,
 )
 
+# Постер пишется на диск блоками, не буферизуясь целиком в памяти
+POSTER_CHUNK_SIZE = 64 * 1024
+POSTER_MAX_SIZE = 5 * 1024 * 1024  # 5 MB
+POSTER_ALLOWED_TYPES = frozenset({"image/png", "image/jpeg", "image/jpg", "image/webp"})
+
+# Правила перехода между статусами спектакля
+_VALID_TRANSITIONS: dict[PerformanceStatus, frozenset[PerformanceStatus]] = {
+    PerformanceStatus.PREPARATION: frozenset({
+        PerformanceStatus.IN_REPERTOIRE,
+        PerformanceStatus.ARCHIVED,
+    }),
+    PerformanceStatus.IN_REPERTOIRE: frozenset({
+        PerformanceStatus.PAUSED,
+        PerformanceStatus.ARCHIVED,
+    }),
+    PerformanceStatus.PAUSED: frozenset({
+        PerformanceStatus.IN_REPERTOIRE,
+        PerformanceStatus.ARCHIVED,
+    }),
+    PerformanceStatus.ARCHIVED: frozenset({
+        PerformanceStatus.PREPARATION,  # Восстановление
+    }),
+}
+# Обратная таблица: из каких статусов можно попасть в данный
+_TRANSITION_SOURCES: dict[PerformanceStatus, frozenset[PerformanceStatus]] = {
+    target: frozenset(
+        source for source, targets in _VALID_TRANSITIONS.items() if target in targets
+    )
+    for target in PerformanceStatus
+}
+
+# Кэш статистики: theater_id -> (время записи, статистика).
+# Дашборд опрашивает статистику часто, а устаревание на TTL допустимо;
+# изменения спектаклей в этом процессе сбрасывают кэш после commit
+_STATS_CACHE_TTL = 60.0
+_stats_cache: dict[int | None, tuple[float, PerformanceStats]] = {}
+
+
+@lru_cache(maxsize=1024)
+def _ensure_dir(path: Path) -> None:
+    """Создать каталог один раз за время жизни процесса."""
+    path.mkdir(parents=True, exist_ok=True)
+
 
 class PerformanceService:
     """
     Сервис спектаклей.
     
     Управляет спектаклями, их паспортами и статусами.
+    Транзакцией владеет get_session: commit выполняется один раз
+    в конце запроса, сервис только выполняет запросы и flush.
     """
     
     def __init__(self, session: AsyncSession):
         self._session = session
         self._performance_repo = PerformanceRepository(session)
         self._section_repo = PerformanceSectionRepository(session)
+        # Спектакли, уже загруженные в рамках запроса (сервис создаётся на запрос)
+        self._loaded: dict[int, Performance] = {}
         self._storage_path = Path(settings.STORAGE_PATH) / "performances"
-        self._storage_path.mkdir(parents=True, exist_ok=True)
+        _ensure_dir(self._storage_path)
     
     # =========================================================================
     # Performances
@@ -59,9 +120,9 @@ class PerformanceService:
         theater_id: int | None = None,
         skip: int = 0,
         limit: int = 20,
-    ) -> tuple[list[Performance], int]:
+    ) -> tuple[Sequence[Performance], int]:
         """Получить список спектаклей с фильтрацией."""
-        performances, total = await self._performance_repo.search(
+        return await self._performance_repo.search(
             search=search,
             status=status,
             genre=genre,
@@ -70,22 +131,37 @@ class PerformanceService:
             skip=skip,
             limit=limit,
         )
-        return list(performances), total
     
     async def get_performance(self, performance_id: int) -> Performance:
         """Получить спектакль по ID с разделами."""
+        performance = self._loaded.get(performance_id)
+        if performance is not None:
+            return performance
+        
         performance = await self._performance_repo.get_with_sections(performance_id)
         if not performance:
             raise NotFoundError(f"Спектакль с ID {performance_id} не найден")
+        self._loaded[performance_id] = performance
         return performance
     
+    async def get_performance_response(self, performance_id: int) -> PerformanceResponse:
+        """
+        Получить спектакль с разделами сразу в виде схемы ответа.
+        
+        Путь только для чтения: один запрос (разделы агрегируются
+        в БД), без создания ORM-объектов.
+        """
+        row = await self._performance_repo.get_with_sections_row(performance_id)
+        if row is None:
+            raise NotFoundError(f"Спектакль с ID {performance_id} не найден")
+        return PerformanceResponse.model_validate(row)
+    
     async def get_repertoire(
         self,
         theater_id: int | None = None,
-    ) -> list[Performance]:
+    ) -> Sequence[Performance]:
         """Получить текущий репертуар."""
-        performances = await self._performance_repo.get_repertoire(theater_id)
-        return list(performances)
+        return await self._performance_repo.get_repertoire(theater_id)
     
     async def create_performance(
         self,
@@ -115,15 +191,19 @@ class PerformanceService:
         await self._session.flush()
         
         # Создаём стандартные разделы паспорта
+        sections = []
         if create_default_sections:
-            await self._section_repo.create_default_sections(
+            sections = await self._section_repo.create_default_sections(
                 performance_id=performance.id,
                 user_id=user_id,
             )
+        # Разделы вернул INSERT ... RETURNING — заполняем коллекцию
+        # без повторной выборки
+        set_committed_value(performance, "sections", sections)
         
-        await self._session.commit()
+        self._invalidate_stats()
         
-        return await self._performance_repo.get_with_sections(performance.id)
+        return performance
     
     async def update_performance(
         self,
@@ -132,24 +212,36 @@ class PerformanceService:
         user_id: int,
     ) -> Performance:
         """Обновить спектакль."""
-        await self.get_performance(performance_id)
-        
         update_data = data.model_dump(exclude_unset=True)
         update_data["updated_by_id"] = user_id
         
-        await self._performance_repo.update_by_id(performance_id, update_data)
-        await self._session.commit()
+        # Один UPDATE ... RETURNING вместо чтения, обновления и перечитывания
+        performance = await self._performance_repo.update_with_sections(
+            performance_id, update_data
+        )
+        if performance is None:
+            raise NotFoundError(f"Спектакль с ID {performance_id} не найден")
+        
+        self._invalidate_stats()
         
-        return await self._performance_repo.get_with_sections(performance_id)
+        return performance
     
     async def delete_performance(self, performance_id: int, user_id: int) -> bool:
         """Удалить спектакль (soft delete)."""
-        await self.get_performance(performance_id)
-        await self._performance_repo.update_by_id(performance_id, {
-            "is_active": False,
-            "updated_by_id": user_id,
-        })
-        await self._session.commit()
+        # Один UPDATE без чтения: строку возвращать не нужно, а условие
+        # по is_active не даёт повторно «удалить» уже удалённый спектакль
+        result = await self._session.execute(
+            update(Performance)
+            .where(
+                Performance.id == performance_id,
+                Performance.is_active.is_(True),
+            )
+            .values(is_active=False, updated_by_id=user_id)
+        )
+        if result.rowcount == 0:
+            raise NotFoundError(f"Спектакль с ID {performance_id} не найден")
+        self._invalidate_stats()
+        self._loaded.pop(performance_id, None)
         return True
     
     # =========================================================================
@@ -167,40 +259,25 @@ class PerformanceService:
         
         Валидирует переходы между статусами.
         """
-        performance = await self.get_performance(performance_id)
-        current_status = performance.status
-        
-        # Правила перехода
-        valid_transitions = {
-            PerformanceStatus.PREPARATION: [
-                PerformanceStatus.IN_REPERTOIRE,
-                PerformanceStatus.ARCHIVED,
-            ],
-            PerformanceStatus.IN_REPERTOIRE: [
-                PerformanceStatus.PAUSED,
-                PerformanceStatus.ARCHIVED,
-            ],
-            PerformanceStatus.PAUSED: [
-                PerformanceStatus.IN_REPERTOIRE,
-                PerformanceStatus.ARCHIVED,
-            ],
-            PerformanceStatus.ARCHIVED: [
-                PerformanceStatus.PREPARATION,  # Восстановление
-            ],
-        }
-        
-        if new_status not in valid_transitions.get(current_status, []):
+        # Допустимость перехода проверяется в WHERE того же UPDATE
+        performance = await self._performance_repo.update_with_sections(
+            performance_id,
+            {"status": new_status, "updated_by_id": user_id},
+            Performance.status.in_(_TRANSITION_SOURCES[new_status]),
+        )
+        if performance is None:
+            # Строка не обновлена: спектакля нет или переход из текущего
+            # статуса недопустим. Для сообщения нужен только статус
+            current_status = await self._performance_repo.get_status(performance_id)
+            if current_status is None:
+                raise NotFoundError(f"Спектакль с ID {performance_id} не найден")
             raise ValidationError(
                 f"Невозможно перейти из статуса '{current_status.value}' в '{new_status.value}'"
             )
         
-        await self._performance_repo.update_by_id(performance_id, {
-            "status": new_status,
-            "updated_by_id": user_id,
-        })
-        await self._session.commit()
+        self._invalidate_stats()
         
-        return await self._performance_repo.get_with_sections(performance_id)
+        return performance
     
     async def to_repertoire(self, performance_id: int, user_id: int) -> Performance:
         """Перевести спектакль в репертуар."""
@@ -245,46 +322,93 @@ class PerformanceService:
         user_id: int,
     ) -> Performance:
         """Загрузить постер спектакля."""
-        performance = await self.get_performance(performance_id)
-        
         # Проверяем тип файла
-        allowed_types = {"image/png", "image/jpeg", "image/jpg", "image/webp"}
-        if file.content_type not in allowed_types:
+        if file.content_type not in POSTER_ALLOWED_TYPES:
             raise ValidationError("Допустимы только изображения (PNG, JPEG, WebP)")
         
-        # Читаем файл
-        content = await file.read()
-        max_size = 5 * 1024 * 1024  # 5 MB
-        if len(content) > max_size:
+        # Размер известен заранее, если его передал multipart-парсер;
+        # лимит при чтении ниже всё равно проверяется
+        if file.size is not None and file.size > POSTER_MAX_SIZE:
             raise ValidationError("Размер файла не должен превышать 5 MB")
         
-        # Сохраняем
         ext = Path(file.filename or "poster.jpg").suffix or ".jpg"
         poster_path = f"{performance_id}/poster{ext}"
+        
         full_path = self._storage_path / poster_path
-        full_path.parent.mkdir(parents=True, exist_ok=True)
+        _ensure_dir(full_path.parent)
         
-        with open(full_path, "wb") as f:
-            f.write(content)
+        # Файл пишется до UPDATE, чтобы блокировка строки не удерживалась
+        # на время дискового I/O. Пишем во временный файл блоками, считая
+        # размер и хэш на лету
+        # Имя уникально: параллельные загрузки постера одного спектакля
+        # не пишут в один файл и не удаляют чужие данные
+        tmp_path = full_path.with_name(f"{full_path.name}.{uuid.uuid4().hex}.part")
+        try:
+            written = 0
+            digest = hashlib.blake2b(digest_size=32)
+            async with aiofiles.open(tmp_path, "wb") as f:
+                while chunk := await file.read(POSTER_CHUNK_SIZE):
+                    written += len(chunk)
+                    if written > POSTER_MAX_SIZE:
+                        raise ValidationError("Размер файла не должен превышать 5 MB")
+                    digest.update(chunk)
+                    await f.write(chunk)
+            poster_hash = digest.hexdigest()
+            
+            # UPDATE заодно проверяет, что спектакль существует;
+            # строка не меняется, если загружен тот же самый постер
+            performance = await self._performance_repo.update_with_sections(
+                performance_id,
+                {
+                    "poster_path": poster_path,
+                    "poster_hash": poster_hash,
+                    "updated_by_id": user_id,
+                },
+                or_(
+                    Performance.poster_path.is_distinct_from(poster_path),
+                    Performance.poster_hash.is_distinct_from(poster_hash),
+                ),
+            )
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
         
-        # Обновляем спектакль
-        await self._performance_repo.update_by_id(performance_id, {
-            "poster_path": poster_path,
-            "updated_by_id": user_id,
-        })
-        await self._session.commit()
+        if performance is None:
+            # Спектакля нет (NotFoundError) или постер не изменился
+            try:
+                performance = await self.get_performance(performance_id)
+                if not full_path.exists():
+                    # Строка уже указывает на этот постер, пропал только файл
+                    tmp_path.replace(full_path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+            return performance
         
-        return await self._performance_repo.get_with_sections(performance_id)
+        # Текущий постер заменяется только после commit транзакции,
+        # при откате временный файл удаляется
+        call_after_commit(
+            self._session,
+            lambda: tmp_path.replace(full_path),
+            lambda: tmp_path.unlink(missing_ok=True),
+        )
+        return performance
     
     # =========================================================================
     # Sections
     # =========================================================================
     
-    async def get_sections(self, performance_id: int) -> list[PerformanceSection]:
+    async def get_sections(self, performance_id: int) -> Sequence[PerformanceSection]:
         """Получить разделы паспорта спектакля."""
-        await self.get_performance(performance_id)
+        performance = self._loaded.get(performance_id)
+        if performance is not None:
+            return performance.sections
+        
+        # Один запрос по разделам; существование спектакля проверяется
+        # отдельно только если разделов нет (обычно их создают при создании)
         sections = await self._section_repo.get_by_performance(performance_id)
-        return list(sections)
+        if not sections and not await self._performance_repo.exists(performance_id):
+            raise NotFoundError(f"Спектакль с ID {performance_id} не найден")
+        return sections
     
     async def get_section(self, section_id: int) -> PerformanceSection:
         """Получить раздел по ID."""
@@ -300,29 +424,29 @@ class PerformanceService:
         user_id: int,
     ) -> PerformanceSection:
         """Создать раздел паспорта."""
-        await self.get_performance(performance_id)
-        
         # Проверяем, нет ли уже раздела такого типа
-        existing = await self._section_repo.get_by_type(
-            performance_id,
-            data.section_type,
-        )
-        if existing:
+        if await self._section_repo.has_type(performance_id, data.section_type):
             raise ValidationError(
                 f"Раздел типа '{data.section_type.value}' уже существует"
             )
         
-        section = PerformanceSection(
-            performance_id=performance_id,
-            **data.model_dump(),
-            created_by_id=user_id,
-            updated_by_id=user_id,
-        )
-        
-        self._session.add(section)
-        await self._session.commit()
+        # Существование спектакля проверяет внешний ключ
+        try:
+            result = await self._session.execute(
+                insert(PerformanceSection)
+                .values(
+                    performance_id=performance_id,
+                    **data.model_dump(),
+                    created_by_id=user_id,
+                    updated_by_id=user_id,
+                )
+                .returning(PerformanceSection)
+            )
+            section = result.scalar_one()
+        except IntegrityError:
+            raise NotFoundError(f"Спектакль с ID {performance_id} не найден")
         
-        return await self._section_repo.get_by_id(section.id)
+        return section
     
     async def update_section(
         self,
@@ -331,39 +455,45 @@ class PerformanceService:
         user_id: int,
     ) -> PerformanceSection:
         """Обновить раздел паспорта."""
-        await self.get_section(section_id)
-        
         update_data = data.model_dump(exclude_unset=True)
         update_data["updated_by_id"] = user_id
         
-        await self._section_repo.update_by_id(section_id, update_data)
-        await self._session.commit()
+        section = await self._section_repo.update_returning(section_id, update_data)
+        if section is None:
+            raise NotFoundError(f"Раздел с ID {section_id} не найден")
         
-        return await self._section_repo.get_by_id(section_id)
+        return section
     
     async def delete_section(self, section_id: int) -> bool:
         """Удалить раздел паспорта."""
         section = await self.get_section(section_id)
         await self._session.delete(section)
-        await self._session.commit()
+        await self._session.flush()
         return True
     
     # =========================================================================
     # Statistics
     # =========================================================================
     
+    def _invalidate_stats(self) -> None:
+        """
+        Сбросить кэш статистики после commit.
+        
+        Сброс до commit не помогает: get_stats между сбросом и commit
+        снова закэширует старые счётчики на весь TTL.
+        """
+        call_after_commit(self._session, _stats_cache.clear)
+    
     async def get_stats(self, theater_id: int | None = None) -> PerformanceStats:
         """Получить статистику спектаклей."""
-        stats = await self._performance_repo.get_stats(theater_id)
-
-        return PerformanceStats(
-            total_performances=stats["total_performances"],
-            preparation=stats.get("preparation", 0),
-            in_repertoire=stats.get("in_repertoire", 0),
-            paused=stats.get("paused", 0),
-            archived=stats.get("archived", 0),
-            genres=stats.get("genres", []),
-        )
+        cached = _stats_cache.get(theater_id)
+        if cached and time.monotonic() - cached[0] < _STATS_CACHE_TTL:
+            return cached[1].model_copy()
+        
+        # Репозиторий возвращает все счётчики, включая нулевые
+        stats = PerformanceStats(**await self._performance_repo.get_stats(theater_id))
+        _stats_cache[theater_id] = (time.monotonic(), stats)
+        return stats.model_copy()
 
     # =========================================================================
     # Checklists
@@ -371,15 +501,11 @@ class PerformanceService:
 
     async def get_checklists(self, performance_id: int):
         """Получить все чеклисты спектакля."""
-        from sqlalchemy import select
-        from sqlalchemy.orm import selectinload
-        from app.models.checklist import PerformanceChecklist
-
         result = await self._session.execute(
             select(PerformanceChecklist)
             .where(PerformanceChecklist.performance_id == performance_id)
             .where(PerformanceChecklist.is_active == True)
-            .options(selectinload(PerformanceChecklist.items))
+            .options(selectinload(PerformanceChecklist.items), raiseload("*"))
             .order_by(PerformanceChecklist.created_at.desc())
         )
         return result.scalars().all()
@@ -392,66 +518,58 @@ class PerformanceService:
         user_id: int,
     ):
         """Создать чеклист для спектакля."""
-        from app.models.checklist import PerformanceChecklist
-
-        await self.get_performance(performance_id)
+        # Достаточно проверки существования, без загрузки разделов
+        if not await self._performance_repo.exists(performance_id):
+            raise NotFoundError(f"Спектакль с ID {performance_id} не найден")
 
-        checklist = PerformanceChecklist(
-            performance_id=performance_id,
-            name=name,
-            description=description,
-            created_by_id=user_id,
-            updated_by_id=user_id,
+        # RETURNING отдаёт id и серверные created_at/updated_at,
+        # перечитывать чеклист после commit не нужно
+        result = await self._session.execute(
+            insert(PerformanceChecklist)
+            .values(
+                performance_id=performance_id,
+                name=name,
+                description=description,
+                created_by_id=user_id,
+                updated_by_id=user_id,
+            )
+            .returning(PerformanceChecklist)
         )
-        self._session.add(checklist)
-        await self._session.commit()
-        await self._session.refresh(checklist)
+        checklist = result.scalar_one()
         return checklist
 
     async def delete_checklist(self, checklist_id: int) -> bool:
         """Удалить чеклист."""
-        from sqlalchemy import select
-        from app.models.checklist import PerformanceChecklist
-
-        result = await self._session.execute(
-            select(PerformanceChecklist).where(PerformanceChecklist.id == checklist_id)
-        )
-        checklist = result.scalar_one_or_none()
+        checklist = await self._session.get(PerformanceChecklist, checklist_id)
         if not checklist:
             raise NotFoundError(f"Чеклист с ID {checklist_id} не найден")
 
         await self._session.delete(checklist)
-        await self._session.commit()
+        await self._session.flush()
         return True
 
     async def add_checklist_item(self, checklist_id: int, description: str):
         """Добавить элемент в чеклист."""
-        from sqlalchemy import select, func
-        from app.models.checklist import PerformanceChecklist, ChecklistItem
-
-        # Проверяем существование чеклиста
-        result = await self._session.execute(
-            select(PerformanceChecklist).where(PerformanceChecklist.id == checklist_id)
-        )
-        checklist = result.scalar_one_or_none()
-        if not checklist:
-            raise NotFoundError(f"Чеклист с ID {checklist_id} не найден")
-
-        # Получаем максимальный sort_order
-        max_order_result = await self._session.execute(
-            select(func.coalesce(func.max(ChecklistItem.sort_order), 0))
+        # Следующий sort_order считается в том же INSERT;
+        # существование чеклиста проверяет внешний ключ
+        next_order = (
+            select(func.coalesce(func.max(ChecklistItem.sort_order), 0) + 1)
             .where(ChecklistItem.checklist_id == checklist_id)
+            .scalar_subquery()
         )
-        max_order = max_order_result.scalar() or 0
-
-        item = ChecklistItem(
-            checklist_id=checklist_id,
-            description=description,
-            sort_order=max_order + 1,
+        query = (
+            insert(ChecklistItem)
+            .values(
+                checklist_id=checklist_id,
+                description=description,
+                sort_order=next_order,
+            )
+            .returning(ChecklistItem)
         )
-        self._session.add(item)
-        await self._session.commit()
-        await self._session.refresh(item)
+        try:
+            item = (await self._session.execute(query)).scalar_one()
+        except IntegrityError:
+            raise NotFoundError(f"Чеклист с ID {checklist_id} не найден")
         return item
 
     async def update_checklist_item(
@@ -463,43 +581,45 @@ class PerformanceService:
         assigned_to_id: int | None = None,
     ):
         """Обновить элемент чеклиста."""
-        from datetime import datetime
-        from sqlalchemy import select
-        from app.models.checklist import ChecklistItem
-
-        result = await self._session.execute(
-            select(ChecklistItem).where(ChecklistItem.id == item_id)
-        )
-        item = result.scalar_one_or_none()
-        if not item:
-            raise NotFoundError(f"Элемент чеклиста с ID {item_id} не найден")
-
+        changes: dict = {}
         if description is not None:
-            item.description = description
+            changes["description"] = description
         if is_completed is not None:
-            item.is_completed = is_completed
-            item.completed_at = datetime.utcnow() if is_completed else None
+            changes["is_completed"] = is_completed
+            # Колонка без часового пояса хранит UTC: asyncpg не принимает
+            # aware-значения для timestamp without time zone
+            changes["completed_at"] = (
+                datetime.now(UTC).replace(tzinfo=None) if is_completed else None
+            )
         if sort_order is not None:
-            item.sort_order = sort_order
+            changes["sort_order"] = sort_order
         if assigned_to_id is not None:
-            item.assigned_to_id = assigned_to_id
-
-        await self._session.commit()
-        await self._session.refresh(item)
-        return item
+            changes["assigned_to_id"] = assigned_to_id
 
-    async def delete_checklist_item(self, item_id: int) -> bool:
-        """Удалить элемент чеклиста."""
-        from sqlalchemy import select
-        from app.models.checklist import ChecklistItem
+        # Пустой PATCH не открывает транзакцию на запись
+        if not changes:
+            item = await self._session.get(ChecklistItem, item_id)
+            if not item:
+                raise NotFoundError(f"Элемент чеклиста с ID {item_id} не найден")
+            return item
 
         result = await self._session.execute(
-            select(ChecklistItem).where(ChecklistItem.id == item_id)
+            update(ChecklistItem)
+            .where(ChecklistItem.id == item_id)
+            .values(**changes)
+            .returning(ChecklistItem)
         )
         item = result.scalar_one_or_none()
+        if item is None:
+            raise NotFoundError(f"Элемент чеклиста с ID {item_id} не найден")
+        return item
+
+    async def delete_checklist_item(self, item_id: int) -> bool:
+        """Удалить элемент чеклиста."""
+        item = await self._session.get(ChecklistItem, item_id)
         if not item:
             raise NotFoundError(f"Элемент чеклиста с ID {item_id} не найден")
 
         await self._session.delete(item)
-        await self._session.commit()
+        await self._session.flush()
         return True
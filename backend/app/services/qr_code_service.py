@@ -4,21 +4,197 @@
 Генерирует QR-коды для быстрой идентификации предметов
 через мобильное приложение или сканер.
 """
+import asyncio
+import hashlib
 import io
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from typing import Literal
 
 import qrcode
 from qrcode.image.styledpil import StyledPilImage
-from qrcode.image.styles.moduledrawers import (
-    RoundedModuleDrawer,
-    SquareModuleDrawer,
-)
+from qrcode.image.styles.moduledrawers import RoundedModuleDrawer
 from PIL import Image
 
 
 QRStyle = Literal["square", "rounded"]
 QRFormat = Literal["png", "svg"]
 
+# Данные QR-кода предмета в каноническом виде: ссылка на карточку
+# или INV:<id>, за ними необязательно "|" и инвентарный номер.
+# Остальные строки разбирает _decode_qr_data_fallback
+_QR_DATA_RE = re.compile(
+    r"(?:(?P<url>http(?:(?!/inventory/)[^|])*/inventory/(?P<url_id>\d+))"
+    r"|INV:(?P<inv_id>\d+))"
+    r"(?:\|(?P<number>[^|]+))?"
+)
+
+# Версия отрисовки, входит в ETag: при изменении внешнего вида QR-кодов
+# увеличить, чтобы клиенты не использовали закэшированные изображения
+QR_RENDER_VERSION = 1
+
+# Сколько QR-кодов пакета отрисовывается одной задачей пула процессов
+QR_BATCH_CHUNK_SIZE = 8
+
+# Пул процессов для растеризации: кодирование QR и работа PIL
+# занимают CPU и не должны блокировать event loop.
+# Создаётся при первом обращении, закрывается при остановке приложения
+_executor: ProcessPoolExecutor | None = None
+
+
+def get_qr_executor() -> ProcessPoolExecutor:
+    """Получить пул процессов для генерации QR-кодов."""
+    global _executor
+    if _executor is None:
+        # spawn: дочерние процессы не наследуют потоки и соединения
+        # родительского процесса (asyncpg, Redis)
+        _executor = ProcessPoolExecutor(
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def shutdown_qr_executor() -> None:
+    """Остановить пул процессов (вызывается в lifespan)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
+
+
+def _render_qr_image(data: str, style: QRStyle, size: int) -> Image.Image:
+    """Отрисовать QR-код в изображение PIL."""
+    # Создаём QR-код
+    qr = qrcode.QRCode(
+        version=None,  # Автоопределение версии
+        error_correction=qrcode.constants.ERROR_CORRECT_M,
+        box_size=10,
+        border=2,
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+
+    # Рисуем сразу в целевом размере: модуль — целое число пикселей
+    qr.box_size = max(1, size // (qr.modules_count + 2 * qr.border))
+
+    # Генерируем изображение. Квадратные модули рисует стандартная
+    # фабрика PilImage (заливка прямоугольниками, без отрисовки каждого
+    # модуля через StyledPilImage). StyledPilImage берёт цвет из маски
+    # (по умолчанию чёрный), поэтому и здесь модули чёрные в RGB —
+    # результат совпадает побайтно
+    if style == "rounded":
+        img = qr.make_image(
+            image_factory=StyledPilImage,
+            module_drawer=RoundedModuleDrawer(),
+            fill_color="#0F1419",  # Тёмная тема
+            back_color="white",
+        )
+    else:
+        img = qr.make_image(fill_color=(0, 0, 0), back_color="white")
+
+    # Размер модуля подобран так, что изображение не больше size:
+    # досчитываем его до size белыми полями без пересэмплирования.
+    # Растягиваем (NEAREST, без сглаживания) только если даже
+    # модуль в 1 px не помещается
+    image = img.get_image()
+    if image.size != (size, size):
+        if image.width > size:
+            image = image.resize((size, size), Image.Resampling.NEAREST)
+        else:
+            canvas = Image.new(image.mode, (size, size), "white")
+            offset = (size - image.width) // 2
+            canvas.paste(image, (offset, offset))
+            image = canvas
+
+    return image
+
+
+@lru_cache(maxsize=256)
+def _render_label_qr_image(data: str, size: int) -> Image.Image:
+    """
+    Отрисовать QR-код для листа этикеток.
+
+    Кэшируются только эти небольшие изображения (100 px в RGB —
+    около 30 KB, весь кэш — до ~8 MB на процесс); отдельные QR-коды
+    размером до 1000 px кэшируются уже сжатыми в PNG.
+    Изображение используется совместно: его можно вставлять
+    и сохранять, но нельзя изменять на месте.
+    """
+    return _render_qr_image(data, "square", size)
+
+
+@lru_cache(maxsize=4096)
+def _render_qr_png(data: str, style: QRStyle, size: int) -> bytes:
+    """
+    Отрисовать QR-код в PNG.
+
+    Результат зависит только от аргументов, поэтому кэшируется:
+    повторная генерация того же кода (этикетки, карточка предмета)
+    не кодирует и не растеризует его заново. Кэш свой у каждого
+    процесса, включая процессы пула.
+    """
+    # Быстрое сжатие: PNG одного кода небольшой, а кодирование
+    # с уровнем по умолчанию (6) занимает заметную долю времени
+    buffer = io.BytesIO()
+    _render_qr_image(data, style, size).save(
+        buffer, format="PNG", optimize=False, compress_level=1
+    )
+    return buffer.getvalue()
+
+
+def _render_qr_png_batch(
+    payloads: list[str],
+    style: QRStyle,
+    size: int,
+) -> list[bytes]:
+    """Отрисовать группу QR-кодов за одну задачу пула процессов."""
+    return [_render_qr_png(data, style, size) for data in payloads]
+
+
+def _render_label_sheet(
+    items: list[tuple[int, str, str]],
+    cols: int,
+    rows: int,
+) -> bytes:
+    """Сгенерировать лист этикеток в дочернем процессе."""
+    return QRCodeService().generate_label_sheet(items=items, cols=cols, rows=rows)
+
+
+def _decode_qr_data_fallback(data: str) -> dict:
+    """
+    Разобрать данные QR-кода нестандартного вида.
+
+    Прежний построчный разбор: для строк вне _QR_DATA_RE (лишние "|",
+    пустой номер, путь после ID, нечисловой ID) даёт те же результаты
+    и ошибки, что и раньше.
+    """
+    result = {"item_id": None, "inventory_number": None, "url": None}
+
+    if data.startswith("http"):
+        result["url"] = data
+        # Извлекаем ID из URL
+        parts = data.split("/")
+        if "inventory" in parts:
+            idx = parts.index("inventory")
+            if idx + 1 < len(parts):
+                id_part = parts[idx + 1].split("|")[0]
+                result["item_id"] = int(id_part)
+
+    elif data.startswith("INV:"):
+        # Формат INV:123|INV-2025-00001
+        parts = data[4:].split("|")
+        result["item_id"] = int(parts[0])
+        if len(parts) > 1:
+            result["inventory_number"] = parts[1]
+
+    # Проверяем есть ли инвентарный номер в конце
+    if "|" in data and not result["inventory_number"]:
+        result["inventory_number"] = data.split("|")[-1]
+
+    return result
+
 
 class QRCodeService:
     """
@@ -35,6 +211,8 @@ class QRCodeService:
                       Если не указан, кодируется только ID.
         """
         self._base_url = base_url
+        # Префикс данных собирается один раз, а не при каждой генерации
+        self._url_prefix = f"{base_url}/inventory/" if base_url else None
 
     def generate_inventory_qr(
         self,
@@ -59,47 +237,41 @@ class QRCodeService:
         Returns:
             PNG изображение в байтах
         """
-        # Формируем данные для QR-кода
-        if include_url and self._base_url:
-            data = f"{self._base_url}/inventory/{item_id}"
-        else:
-            data = f"INV:{item_id}"
+        data = self._qr_data(item_id, inventory_number, include_url, include_number)
+        return _render_qr_png(data, style, size)
 
+    def _qr_data(
+        self,
+        item_id: int,
+        inventory_number: str,
+        include_url: bool = True,
+        include_number: bool = True,
+    ) -> str:
+        """Сформировать данные для QR-кода предмета."""
+        prefix = self._url_prefix if include_url and self._url_prefix else "INV:"
         if include_number:
-            data = f"{data}|{inventory_number}"
-
-        # Создаём QR-код
-        qr = qrcode.QRCode(
-            version=None,  # Автоопределение версии
-            error_correction=qrcode.constants.ERROR_CORRECT_M,
-            box_size=10,
-            border=2,
-        )
-        qr.add_data(data)
-        qr.make(fit=True)
-
-        # Выбираем стиль отрисовки
-        module_drawer = (
-            RoundedModuleDrawer() if style == "rounded" else SquareModuleDrawer()
-        )
-
-        # Генерируем изображение
-        img = qr.make_image(
-            image_factory=StyledPilImage,
-            module_drawer=module_drawer,
-            fill_color="#0F1419",  # Тёмная тема
-            back_color="white",
-        )
-
-        # Масштабируем до нужного размера
-        img = img.resize((size, size), Image.Resampling.LANCZOS)
+            return f"{prefix}{item_id}|{inventory_number}"
+        return f"{prefix}{item_id}"
 
-        # Конвертируем в байты
-        buffer = io.BytesIO()
-        img.save(buffer, format="PNG")
-        buffer.seek(0)
+    def inventory_qr_etag(
+        self,
+        item_id: int,
+        inventory_number: str,
+        style: QRStyle = "rounded",
+        size: int = 300,
+    ) -> str:
+        """
+        ETag QR-кода предмета.
 
-        return buffer.getvalue()
+        Изображение однозначно определяется данными, стилем и размером,
+        поэтому ETag считается по ним без отрисовки.
+        """
+        data = self._qr_data(item_id, inventory_number)
+        digest = hashlib.blake2b(
+            f"{QR_RENDER_VERSION}|{style}|{size}|{data}".encode(),
+            digest_size=8,
+        ).hexdigest()
+        return f'W/"{digest}"'
 
     def generate_batch_qr(
         self,
@@ -129,6 +301,65 @@ class QRCodeService:
             results.append((item_id, qr_bytes))
         return results
 
+    async def generate_inventory_qr_async(
+        self,
+        item_id: int,
+        inventory_number: str,
+        style: QRStyle = "rounded",
+        size: int = 300,
+    ) -> bytes:
+        """Генерирует QR-код предмета в пуле процессов."""
+        data = self._qr_data(item_id, inventory_number)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_qr_executor(), _render_qr_png, data, style, size,
+        )
+
+    async def generate_batch_qr_async(
+        self,
+        items: list[tuple[int, str]],
+        style: QRStyle = "rounded",
+        size: int = 200,
+    ) -> list[tuple[int, bytes]]:
+        """
+        Генерирует QR-коды для нескольких предметов в пуле процессов.
+
+        Коды независимы, поэтому генерируются параллельно
+        на всех ядрах; порядок результатов совпадает с items.
+        В пул отправляются группы по QR_BATCH_CHUNK_SIZE кодов, чтобы
+        накладные расходы на задачу не преобладали над отрисовкой.
+        """
+        payloads = [
+            self._qr_data(item_id, inventory_number)
+            for item_id, inventory_number in items
+        ]
+        loop = asyncio.get_running_loop()
+        executor = get_qr_executor()
+        chunks = await asyncio.gather(*(
+            loop.run_in_executor(
+                executor,
+                _render_qr_png_batch,
+                payloads[start:start + QR_BATCH_CHUNK_SIZE],
+                style,
+                size,
+            )
+            for start in range(0, len(payloads), QR_BATCH_CHUNK_SIZE)
+        ))
+        images = [image for chunk in chunks for image in chunk]
+        return [(item_id, image) for (item_id, _), image in zip(items, images)]
+
+    async def generate_label_sheet_async(
+        self,
+        items: list[tuple[int, str, str]],
+        cols: int = 3,
+        rows: int = 8,
+    ) -> bytes:
+        """Генерирует лист с этикетками в пуле процессов."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_qr_executor(), _render_label_sheet, items, cols, rows,
+        )
+
     def generate_label_sheet(
         self,
         items: list[tuple[int, str, str]],
@@ -183,14 +414,11 @@ class QRCodeService:
             x = col * cell_width + (cell_width - qr_size) // 2
             y = row * cell_height + 10
 
-            # Генерируем QR-код
-            qr_bytes = self.generate_inventory_qr(
-                item_id=item_id,
-                inventory_number=inv_number,
-                style="square",
-                size=qr_size,
+            # Генерируем QR-код сразу изображением, без PNG-кодирования
+            # и повторного декодирования
+            qr_img = _render_label_qr_image(
+                self._qr_data(item_id, inv_number), qr_size
             )
-            qr_img = Image.open(io.BytesIO(qr_bytes))
 
             # Вставляем QR-код
             sheet.paste(qr_img, (x, y))
@@ -230,27 +458,20 @@ class QRCodeService:
         Returns:
             Словарь с item_id и inventory_number
         """
-        result = {"item_id": None, "inventory_number": None, "url": None}
-
-        if data.startswith("http"):
-            result["url"] = data
-            # Извлекаем ID из URL
-            parts = data.split("/")
-            if "inventory" in parts:
-                idx = parts.index("inventory")
-                if idx + 1 < len(parts):
-                    id_part = parts[idx + 1].split("|")[0]
-                    result["item_id"] = int(id_part)
-
-        elif data.startswith("INV:"):
-            # Формат INV:123|INV-2025-00001
-            parts = data[4:].split("|")
-            result["item_id"] = int(parts[0])
-            if len(parts) > 1:
-                result["inventory_number"] = parts[1]
-
-        # Проверяем есть ли инвентарный номер в конце
-        if "|" in data and not result["inventory_number"]:
-            result["inventory_number"] = data.split("|")[-1]
-
-        return result
+        # Форматы: <url>/inventory/123|INV-2025-00001 и INV:123|INV-2025-00001
+        match = _QR_DATA_RE.fullmatch(data)
+        if match is None:
+            return _decode_qr_data_fallback(data)
+
+        if match["url"] is not None:
+            item_id = match["url_id"]
+            url = data
+        else:
+            item_id = match["inv_id"]
+            url = None
+
+        return {
+            "item_id": int(item_id),
+            "inventory_number": match["number"],
+            "url": url,
+        }
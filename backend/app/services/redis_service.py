@@ -13,6 +13,9 @@ import redis.asyncio as redis
 from app.config import settings
 from app.core.constants import RedisPrefix
 
+# Размер пачки ключей при SCAN и удалении по паттерну
+_SCAN_BATCH_SIZE = 500
+
 
 class RedisService:
     """
@@ -131,6 +134,52 @@ class RedisService:
         key = f"{RedisPrefix.TOKEN_BLACKLIST.value}{token}"
         return await self.client.exists(key) > 0
     
+    async def are_tokens_blacklisted(self, tokens: list[str]) -> list[bool]:
+        """
+        Проверить несколько токенов одним запросом (MGET).
+        
+        Args:
+            tokens: Access токены для проверки
+            
+        Returns:
+            Для каждого токена (в том же порядке) True, если он в blacklist
+        """
+        if not tokens:
+            return []
+        
+        prefix = RedisPrefix.TOKEN_BLACKLIST.value
+        values = await self.client.mget([f"{prefix}{token}" for token in tokens])
+        return [value is not None for value in values]
+    
+    async def logout(
+        self,
+        user_id: int,
+        access_token: str,
+        expires_in: timedelta | None = None,
+    ) -> None:
+        """
+        Удалить refresh token и добавить access token в blacklist.
+        
+        Обе команды отправляются одной транзакцией (MULTI/EXEC)
+        за один round-trip.
+        
+        Args:
+            user_id: ID пользователя
+            access_token: Текущий access token
+            expires_in: Время хранения в blacklist (как в blacklist_token)
+        """
+        if expires_in is None:
+            expires_in = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES + 5)
+        
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.delete(f"{RedisPrefix.REFRESH_TOKEN.value}{user_id}")
+            pipe.setex(
+                f"{RedisPrefix.TOKEN_BLACKLIST.value}{access_token}",
+                expires_in,
+                "1",
+            )
+            await pipe.execute()
+    
     # =========================================================================
     # Generic Cache
     # =========================================================================
@@ -181,16 +230,24 @@ class RedisService:
         Args:
             pattern: Паттерн (например: "user_cache:*")
             
+        Ключи удаляются пачками через UNLINK: память Redis
+        освобождается в фоне, а список ключей не копится целиком.
+        
         Returns:
             Количество удалённых ключей
         """
-        keys = []
-        async for key in self.client.scan_iter(pattern):
-            keys.append(key)
+        client = self.client
+        deleted = 0
+        batch: list[str] = []
+        async for key in client.scan_iter(pattern, count=_SCAN_BATCH_SIZE):
+            batch.append(key)
+            if len(batch) >= _SCAN_BATCH_SIZE:
+                deleted += await client.unlink(*batch)
+                batch.clear()
         
-        if keys:
-            return await self.client.delete(*keys)
-        return 0
+        if batch:
+            deleted += await client.unlink(*batch)
+        return deleted
 
 
 # Глобальный экземпляр
@@ -6,8 +6,11 @@
 - Управление участниками
 - Календарное представление
 """
-from datetime import date, time, timedelta
+from calendar import monthrange
+from datetime import date, time
+from time import monotonic
 
+from sqlalchemy import insert, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import NotFoundError, ValidationError
@@ -32,6 +35,49 @@ from app.schemas.schedule import (
     CalendarDay,
 )
 
+# Статусы, из которых допустим переход
+_CONFIRM_FROM = frozenset({EventStatus.PLANNED})
+_START_FROM = frozenset({EventStatus.PLANNED, EventStatus.CONFIRMED})
+_COMPLETE_FROM = frozenset({EventStatus.IN_PROGRESS, EventStatus.CONFIRMED})
+_CANCEL_FROM = frozenset(EventStatus) - {EventStatus.COMPLETED}
+
+# Кэши календаря и статистики: ключ -> (время записи, значение).
+# Фронтенд опрашивает их часто, а устаревание на TTL допустимо;
+# изменения событий в этом процессе сбрасывают кэши сразу
+_CACHE_TTL = 60.0
+# Год и месяц приходят из URL, поэтому число ключей календаря ограничено
+_CALENDAR_CACHE_MAX_SIZE = 256
+_calendar_cache: dict[tuple[int | None, int, int], tuple[float, list[CalendarDay]]] = {}
+_stats_cache: dict[int | None, tuple[float, ScheduleStats]] = {}
+
+
+def _store_calendar(
+    key: tuple[int | None, int, int], days: list[CalendarDay]
+) -> None:
+    """
+    Положить месяц в кэш календаря.
+    
+    При заполнении кэша сначала удаляются устаревшие записи,
+    затем, если места всё ещё нет, самая старая.
+    """
+    now = monotonic()
+    if len(_calendar_cache) >= _CALENDAR_CACHE_MAX_SIZE:
+        expired = [
+            k for k, (stored_at, _) in _calendar_cache.items()
+            if now - stored_at >= _CACHE_TTL
+        ]
+        for k in expired:
+            del _calendar_cache[k]
+        if len(_calendar_cache) >= _CALENDAR_CACHE_MAX_SIZE:
+            del _calendar_cache[next(iter(_calendar_cache))]
+    _calendar_cache[key] = (now, days)
+
+
+def _invalidate_caches() -> None:
+    """Сбросить кэши календаря и статистики."""
+    _calendar_cache.clear()
+    _stats_cache.clear()
+
 
 class ScheduleService:
     """
@@ -142,18 +188,25 @@ class ScheduleService:
         self._session.add(event)
         await self._session.flush()
         
-        # Добавляем участников
-        for p_data in data.participants:
-            participant = EventParticipant(
-                event_id=event.id,
-                user_id=p_data.user_id,
-                role=p_data.role,
-                status=p_data.status,
-                note=p_data.note,
+        # Добавляем участников одним пакетным INSERT
+        # (объекты не нужны — событие перечитывается со связями ниже)
+        if data.participants:
+            await self._session.execute(
+                insert(EventParticipant),
+                [
+                    {
+                        "event_id": event.id,
+                        "user_id": p_data.user_id,
+                        "role": p_data.role,
+                        "status": p_data.status,
+                        "note": p_data.note,
+                    }
+                    for p_data in data.participants
+                ],
             )
-            self._session.add(participant)
         
         await self._session.commit()
+        _invalidate_caches()
         
         return await self._event_repo.get_with_relations(event.id)
     
@@ -163,90 +216,113 @@ class ScheduleService:
         data: EventUpdate,
         user_id: int,
     ) -> ScheduleEvent:
-        """Обновить событие."""
-        await self.get_event(event_id)
+        """
+        Обновить событие.
         
+        Существование проверяется самим UPDATE ... RETURNING:
+        пустой результат означает, что события нет.
+        """
         update_data = data.model_dump(exclude_unset=True)
         update_data["updated_by_id"] = user_id
         
-        await self._event_repo.update_by_id(event_id, update_data)
+        event = await self._event_repo.update_with_relations(event_id, update_data)
+        if event is None:
+            raise NotFoundError(f"Событие с ID {event_id} не найдено")
         await self._session.commit()
+        _invalidate_caches()
         
-        return await self._event_repo.get_with_relations(event_id)
+        return event
     
     async def delete_event(self, event_id: int, user_id: int) -> bool:
         """Удалить событие (soft delete)."""
-        await self.get_event(event_id)
-        await self._event_repo.update_by_id(event_id, {
-            "is_active": False,
-            "updated_by_id": user_id,
-        })
+        # Один UPDATE без чтения: строку возвращать не нужно, а условие
+        # по is_active не даёт повторно «удалить» уже удалённое событие
+        result = await self._session.execute(
+            update(ScheduleEvent)
+            .where(
+                ScheduleEvent.id == event_id,
+                ScheduleEvent.is_active.is_(True),
+            )
+            .values(is_active=False, updated_by_id=user_id)
+        )
+        if result.rowcount == 0:
+            raise NotFoundError(f"Событие с ID {event_id} не найдено")
         await self._session.commit()
+        _invalidate_caches()
         return True
     
     # =========================================================================
     # Status Management
     # =========================================================================
     
-    async def confirm_event(self, event_id: int, user_id: int) -> ScheduleEvent:
-        """Подтвердить событие."""
-        event = await self.get_event(event_id)
+    async def _change_status(
+        self,
+        event_id: int,
+        new_status: EventStatus,
+        allowed_from: frozenset[EventStatus],
+        error_message: str,
+        user_id: int,
+    ) -> ScheduleEvent:
+        """
+        Перевести событие в новый статус.
         
-        if event.status not in [EventStatus.PLANNED]:
-            raise ValidationError("Можно подтвердить только запланированное событие")
+        Допустимость перехода проверяется в WHERE того же UPDATE:
+        проверка и запись атомарны, без предварительного чтения.
+        """
+        event = await self._event_repo.update_with_relations(
+            event_id,
+            {"status": new_status, "updated_by_id": user_id},
+            ScheduleEvent.status.in_(allowed_from),
+        )
+        if event is None:
+            # Строка не обновлена: события нет или статус не подходит
+            if await self._event_repo.get_status(event_id) is None:
+                raise NotFoundError(f"Событие с ID {event_id} не найдено")
+            raise ValidationError(error_message)
         
-        await self._event_repo.update_by_id(event_id, {
-            "status": EventStatus.CONFIRMED,
-            "updated_by_id": user_id,
-        })
         await self._session.commit()
-        
-        return await self._event_repo.get_with_relations(event_id)
+        _invalidate_caches()
+        return event
+    
+    async def confirm_event(self, event_id: int, user_id: int) -> ScheduleEvent:
+        """Подтвердить событие."""
+        return await self._change_status(
+            event_id,
+            EventStatus.CONFIRMED,
+            _CONFIRM_FROM,
+            "Можно подтвердить только запланированное событие",
+            user_id,
+        )
     
     async def start_event(self, event_id: int, user_id: int) -> ScheduleEvent:
         """Начать событие."""
-        event = await self.get_event(event_id)
-        
-        if event.status not in [EventStatus.PLANNED, EventStatus.CONFIRMED]:
-            raise ValidationError("Невозможно начать событие в текущем статусе")
-        
-        await self._event_repo.update_by_id(event_id, {
-            "status": EventStatus.IN_PROGRESS,
-            "updated_by_id": user_id,
-        })
-        await self._session.commit()
-        
-        return await self._event_repo.get_with_relations(event_id)
+        return await self._change_status(
+            event_id,
+            EventStatus.IN_PROGRESS,
+            _START_FROM,
+            "Невозможно начать событие в текущем статусе",
+            user_id,
+        )
     
     async def complete_event(self, event_id: int, user_id: int) -> ScheduleEvent:
         """Завершить событие."""
-        event = await self.get_event(event_id)
-        
-        if event.status not in [EventStatus.IN_PROGRESS, EventStatus.CONFIRMED]:
-            raise ValidationError("Невозможно завершить событие в текущем статусе")
-        
-        await self._event_repo.update_by_id(event_id, {
-            "status": EventStatus.COMPLETED,
-            "updated_by_id": user_id,
-        })
-        await self._session.commit()
-        
-        return await self._event_repo.get_with_relations(event_id)
+        return await self._change_status(
+            event_id,
+            EventStatus.COMPLETED,
+            _COMPLETE_FROM,
+            "Невозможно завершить событие в текущем статусе",
+            user_id,
+        )
     
     async def cancel_event(self, event_id: int, user_id: int) -> ScheduleEvent:
         """Отменить событие."""
-        event = await self.get_event(event_id)
-        
-        if event.status == EventStatus.COMPLETED:
-            raise ValidationError("Нельзя отменить завершённое событие")
-        
-        await self._event_repo.update_by_id(event_id, {
-            "status": EventStatus.CANCELLED,
-            "updated_by_id": user_id,
-        })
-        await self._session.commit()
-        
-        return await self._event_repo.get_with_relations(event_id)
+        return await self._change_status(
+            event_id,
+            EventStatus.CANCELLED,
+            _CANCEL_FROM,
+            "Нельзя отменить завершённое событие",
+            user_id,
+        )
     
     # =========================================================================
     # Participants
@@ -254,8 +330,11 @@ class ScheduleService:
     
     async def get_participants(self, event_id: int) -> list[EventParticipant]:
         """Получить участников события."""
-        await self.get_event(event_id)
+        # Существование события проверяется только при пустом списке:
+        # обычно хватает одного запроса (пользователи — через selectinload)
         participants = await self._participant_repo.get_by_event(event_id)
+        if not participants and not await self._event_repo.exists(event_id):
+            raise NotFoundError(f"Событие с ID {event_id} не найдено")
         return list(participants)
     
     async def add_participant(
@@ -284,7 +363,9 @@ class ScheduleService:
         self._session.add(participant)
         await self._session.commit()
         
-        return await self._participant_repo.get_by_id(participant.id)
+        # Подгружаем только пользователя (нужен для ответа)
+        await self._session.refresh(participant, attribute_names=["user"])
+        return participant
     
     async def update_participant(
         self,
@@ -292,15 +373,18 @@ class ScheduleService:
         data: ParticipantUpdate,
     ) -> EventParticipant:
         """Обновить участника."""
-        participant = await self._participant_repo.get_by_id(participant_id)
+        update_data = data.model_dump(exclude_unset=True)
+        if update_data:
+            participant = await self._participant_repo.update_with_user(
+                participant_id, update_data
+            )
+        else:
+            participant = await self._participant_repo.get_with_user(participant_id)
         if not participant:
             raise NotFoundError(f"Участник с ID {participant_id} не найден")
         
-        update_data = data.model_dump(exclude_unset=True)
-        await self._participant_repo.update_by_id(participant_id, update_data)
         await self._session.commit()
-        
-        return await self._participant_repo.get_by_id(participant_id)
+        return participant
     
     async def remove_participant(self, participant_id: int) -> bool:
         """Удалить участника."""
@@ -325,10 +409,12 @@ class ScheduleService:
         if not participant:
             raise NotFoundError("Вы не являетесь участником этого события")
         
-        await self._participant_repo.update_by_id(participant.id, {"status": status})
+        participant = await self._participant_repo.update_with_user(
+            participant.id, {"status": status}
+        )
         await self._session.commit()
         
-        return await self._participant_repo.get_by_id(participant.id)
+        return participant
     
     # =========================================================================
     # Calendar
@@ -341,49 +427,37 @@ class ScheduleService:
         theater_id: int | None = None,
     ) -> list[CalendarDay]:
         """Получить календарь на месяц."""
+        key = (theater_id, year, month)
+        cached = _calendar_cache.get(key)
+        if cached and monotonic() - cached[0] < _CACHE_TTL:
+            # Копии: вызывающий код не должен менять закэшированные модели
+            return [day.model_copy(deep=True) for day in cached[1]]
+        
         # Определяем границы месяца
+        days_in_month = monthrange(year, month)[1]
         first_day = date(year, month, 1)
-        if month == 12:
-            last_day = date(year + 1, 1, 1) - timedelta(days=1)
-        else:
-            last_day = date(year, month + 1, 1) - timedelta(days=1)
+        last_day = date(year, month, days_in_month)
         
-        # Получаем события
-        events = await self._event_repo.get_by_date_range(
+        # Получаем события (только поля календаря)
+        rows = await self._event_repo.get_calendar_rows(
             first_day, last_day, theater_id
         )
         
         # Группируем по дням
         days_dict: dict[date, list[CalendarEvent]] = {}
         
-        for event in events:
-            cal_event = CalendarEvent(
-                id=event.id,
-                title=event.title,
-                event_type=event.event_type,
-                status=event.status,
-                date=event.event_date,
-                start=event.start_time,
-                end=event.end_time,
-                color=event.color,
-                performance_id=event.performance_id,
-            )
-            
-            if event.event_date not in days_dict:
-                days_dict[event.event_date] = []
-            days_dict[event.event_date].append(cal_event)
+        for row in rows:
+            days_dict.setdefault(row["date"], []).append(CalendarEvent(**row))
         
         # Формируем список дней
-        calendar_days = []
-        current = first_day
-        while current <= last_day:
-            calendar_days.append(CalendarDay(
-                date=current,
-                events=days_dict.get(current, []),
-            ))
-            current += timedelta(days=1)
-        
-        return calendar_days
+        calendar_days = [
+            CalendarDay(date=current, events=days_dict.get(current, []))
+            for current in (
+                first_day.replace(day=day) for day in range(1, days_in_month + 1)
+            )
+        ]
+        _store_calendar(key, calendar_days)
+        return [day.model_copy(deep=True) for day in calendar_days]
     
     # =========================================================================
     # Statistics
@@ -391,9 +465,13 @@ class ScheduleService:
     
     async def get_stats(self, theater_id: int | None = None) -> ScheduleStats:
         """Получить статистику расписания."""
+        cached = _stats_cache.get(theater_id)
+        if cached and monotonic() - cached[0] < _CACHE_TTL:
+            return cached[1].model_copy()
+        
         stats = await self._event_repo.get_stats(theater_id)
 
-        return ScheduleStats(
+        result = ScheduleStats(
             total_events=stats["total_events"],
             planned=stats.get("planned", 0),
             confirmed=stats.get("confirmed", 0),
@@ -404,6 +482,8 @@ class ScheduleService:
             other_count=stats.get("other_count", 0),
             upcoming_events=stats.get("upcoming_events", 0),
         )
+        _stats_cache[theater_id] = (monotonic(), result)
+        return result.model_copy()
 
     # =========================================================================
     # Conflict Detection
@@ -440,7 +520,7 @@ class ScheduleService:
             Список конфликтующих событий
         """
         from sqlalchemy import select, and_
-        from sqlalchemy.orm import selectinload
+        from sqlalchemy.orm import joinedload
         from datetime import time as dt_time
 
         # Если end_time не указан, считаем конец дня
@@ -460,7 +540,9 @@ class ScheduleService:
                     ScheduleEvent.start_time < end_time,
                 )
             )
-            .options(selectinload(ScheduleEvent.venue))
+            # Площадка у всех событий одна — подгружаем её JOIN'ом
+            # в том же запросе, без второго round-trip
+            .options(joinedload(ScheduleEvent.venue))
         )
 
         # Исключаем текущее событие (при обновлении)
@@ -10,7 +10,9 @@ from typing import Any
 
 from fastapi import UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.config import settings
 from app.core.exceptions import AlreadyExistsError, NotFoundError, ValidationError
 from app.models.document_template import (
     DocumentTemplate,
@@ -32,6 +34,8 @@ from app.services.minio_service import MinioService
 
 # Разрешённые расширения для шаблонов
 ALLOWED_TEMPLATE_EXTENSIONS = {".docx"}
+MAX_TEMPLATE_SIZE = 10 * 1024 * 1024  # 10 MB
+TEMPLATE_READ_CHUNK = 64 * 1024
 
 
 class TemplateService:
@@ -111,7 +115,7 @@ class TemplateService:
         Returns:
             Кортеж (список шаблонов, общее количество)
         """
-        templates = await self._template_repo.get_all(
+        return await self._template_repo.get_page(
             skip=skip,
             limit=limit,
             theater_id=theater_id,
@@ -119,14 +123,6 @@ class TemplateService:
             is_active=is_active,
         )
 
-        total = await self._template_repo.count(
-            theater_id=theater_id,
-            template_type=template_type,
-            is_active=is_active,
-        )
-
-        return templates, total
-
     async def create_template(
         self,
         data: TemplateCreate,
@@ -150,7 +146,7 @@ class TemplateService:
             AlreadyExistsError: Если код уже существует
             ValidationError: Если файл невалидный
         """
-        # Проверка уникальности кода
+        # Быстрый отказ до валидации и загрузки файла
         if await self._template_repo.code_exists(data.code):
             raise AlreadyExistsError(f"Шаблон с кодом '{data.code}' уже существует")
 
@@ -175,15 +171,25 @@ class TemplateService:
             "updated_by_id": user_id,
         }
 
-        template = await self._template_repo.create(template_data)
+        # ON CONFLICT DO NOTHING защищает от гонки: код мог занять
+        # параллельный запрос между проверкой и вставкой
+        template = await self._template_repo.create_if_code_free(template_data)
+        if template is None:
+            await self._minio.delete_file(settings.MINIO_BUCKET_DOCUMENTS, file_path)
+            raise AlreadyExistsError(f"Шаблон с кодом '{data.code}' уже существует")
 
         # Создание переменных, если переданы
         if data.variables:
             variables_data = [v.model_dump() for v in data.variables]
-            await self._variable_repo.bulk_create(template.id, variables_data)
-
-            # Перезагрузка шаблона с переменными
-            template = await self._template_repo.get_by_id(template.id)
+            variables = await self._variable_repo.bulk_create(
+                template.id, variables_data
+            )
+            # Переменные уже получены из RETURNING — без повторного SELECT
+            set_committed_value(
+                template,
+                "variables",
+                sorted(variables, key=lambda v: v.sort_order),
+            )
 
         await self._session.commit()
         return template
@@ -301,9 +307,12 @@ class TemplateService:
         template_id: int,
     ) -> list[DocumentTemplateVariable]:
         """Получить все переменные шаблона."""
-        # Проверка существования шаблона
-        await self.get_template(template_id)
-        return await self._variable_repo.get_by_template_id(template_id)
+        # Существование шаблона проверяется только при пустом списке,
+        # а не отдельным запросом шаблона со всеми переменными
+        variables = await self._variable_repo.get_by_template_id(template_id)
+        if not variables and not await self._template_repo.exists(template_id):
+            raise NotFoundError(f"Шаблон с ID {template_id} не найден")
+        return variables
 
     async def create_variable(
         self,
@@ -409,12 +418,19 @@ class TemplateService:
                 f"Недопустимый формат файла. Разрешены: {', '.join(ALLOWED_TEMPLATE_EXTENSIONS)}"
             )
 
-        # Проверка размера (10 MB макс для шаблонов)
-        max_size = 10 * 1024 * 1024
-        content = await file.read()
-        await file.seek(0)
-
-        if len(content) > max_size:
+        # Проверка размера (10 MB макс для шаблонов). Размер известен
+        # после разбора multipart; иначе считаем его по чанкам,
+        # не держа файл в памяти целиком
+        size = file.size
+        if size is None:
+            size = 0
+            while chunk := await file.read(TEMPLATE_READ_CHUNK):
+                size += len(chunk)
+                if size > MAX_TEMPLATE_SIZE:
+                    break
+            await file.seek(0)
+
+        if size > MAX_TEMPLATE_SIZE:
             raise ValidationError("Размер файла превышает 10 MB")
 
     async def _upload_template_file(
@@ -432,16 +448,13 @@ class TemplateService:
         Returns:
             Путь к файлу в хранилище
         """
-        content = await file.read()
+        # Передаём поток загрузки (SpooledTemporaryFile) напрямую:
+        # put_object читает его сам, без копии содержимого в памяти
         await file.seek(0)
-
-        # Формируем путь: templates/{code}/{filename}
-        file_path = f"templates/{template_code.lower()}/{file.filename}"
-
-        await self._minio.upload_file(
-            file_path=file_path,
-            content=content,
+        return await self._minio.upload_file(
+            bucket=settings.MINIO_BUCKET_DOCUMENTS,
+            file_data=file.file,
+            original_filename=file.filename,
+            prefix=f"templates/{template_code.lower()}/",
             content_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
         )
-
-        return file_path
@@ -23,3 +23,40 @@ class TestInventoryItemsAPI:
     async def test_get_stats_success(self, authorized_client: AsyncClient):
         response = await authorized_client.get("/api/v1/inventory/stats")
         assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+class TestInventoryQRCodeAPI:
+    async def _create_item(self, client: AsyncClient) -> int:
+        response = await client.post(
+            "/api/v1/inventory/items",
+            json={"name": "Предмет для QR", "inventory_number": "QR-ETAG-001"},
+        )
+        assert response.status_code == 201
+        return response.json()["id"]
+
+    async def test_qr_matching_etag_not_modified(self, authorized_client: AsyncClient):
+        item_id = await self._create_item(authorized_client)
+        url = f"/api/v1/inventory/items/{item_id}/qr?size=100&style=square"
+
+        first = await authorized_client.get(url)
+        assert first.status_code == 200
+        etag = first.headers["ETag"]
+
+        response = await authorized_client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+
+    async def test_qr_stale_etag_returns_image(self, authorized_client: AsyncClient):
+        item_id = await self._create_item(authorized_client)
+        url = f"/api/v1/inventory/items/{item_id}/qr?size=100&style=square"
+
+        response = await authorized_client.get(
+            url, headers={"If-None-Match": 'W/"stale"'}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/png"
+        assert response.headers["ETag"].startswith('W/"')
+        assert response.headers["ETag"] != 'W/"stale"'
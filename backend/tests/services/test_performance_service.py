@@ -1,12 +1,18 @@
 """
 Unit-тесты для PerformanceService.
 """
+import io
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from app.config import settings
 from app.services.performance_service import PerformanceService
 from app.models.performance import Performance, PerformanceStatus
-from app.core.exceptions import ValidationError
+from app.core.exceptions import NotFoundError, ValidationError
 
 
 @pytest.mark.asyncio
@@ -17,30 +23,34 @@ class TestPerformanceServiceStatus:
     async def test_to_repertoire_success(self):
         """Успешный переход в репертуар."""
         mock_session = AsyncMock()
+        mock_session.info = {}
         service = PerformanceService(mock_session)
         
         performance = Performance(
-            id=1, title="Тест", status=PerformanceStatus.PREPARATION
+            id=1, title="Тест", status=PerformanceStatus.IN_REPERTOIRE
         )
         
-        service._performance_repo.get_with_sections = AsyncMock(return_value=performance)
-        service._performance_repo.update_by_id = AsyncMock()
-        service._performance_repo.get_with_sections = AsyncMock(
-            return_value=Performance(id=1, title="Тест", status=PerformanceStatus.IN_REPERTOIRE)
-        )
+        service._performance_repo.update_with_sections = AsyncMock(return_value=performance)
+        service._performance_repo.get_with_sections = AsyncMock()
         
         result = await service.to_repertoire(performance_id=1, user_id=1)
         
+        # Статус меняется одним UPDATE ... RETURNING, без предварительной выборки
+        assert result is performance
         assert result.status == PerformanceStatus.IN_REPERTOIRE
-        mock_session.commit.assert_called_once()
+        service._performance_repo.get_with_sections.assert_not_awaited()
+        # Транзакцию фиксирует get_session, а не сервис;
+        # кэш статистики сбрасывается только после commit
+        mock_session.commit.assert_not_called()
+        assert mock_session.info["after_commit_callbacks"]
 
     async def test_invalid_transition_fails(self):
         """Недопустимый переход вызывает ошибку."""
         mock_session = AsyncMock()
         service = PerformanceService(mock_session)
         
-        performance = Performance(id=1, title="Тест", status=PerformanceStatus.PAUSED)
-        service._performance_repo.get_with_sections = AsyncMock(return_value=performance)
+        service._performance_repo.update_with_sections = AsyncMock(return_value=None)
+        service._performance_repo.get_status = AsyncMock(return_value=PerformanceStatus.PAUSED)
         
         with pytest.raises(ValidationError):
             await service.change_status(1, PerformanceStatus.PREPARATION, user_id=1)
@@ -62,10 +72,84 @@ class TestPerformanceServiceStats:
             "in_repertoire": 12,
             "paused": 3,
             "archived": 5,
-            "genres": ["драма"],
+            "genres": [{"genre": "драма", "count": 10}],
         })
         
         result = await service.get_stats(theater_id=1)
         
         assert result.total_performances == 25
         assert result.in_repertoire == 12
+
+
+@pytest.mark.asyncio
+@pytest.mark.service
+class TestPerformanceServicePoster:
+    """Тесты загрузки постера."""
+
+    @pytest.fixture
+    def service(self, tmp_path, monkeypatch) -> PerformanceService:
+        """Сервис с хранилищем во временном каталоге."""
+        monkeypatch.setattr(settings, "STORAGE_PATH", str(tmp_path))
+        mock_session = AsyncMock()
+        mock_session.info = {}
+        return PerformanceService(mock_session)
+
+    @staticmethod
+    def _poster(content: bytes) -> UploadFile:
+        return UploadFile(
+            file=io.BytesIO(content),
+            filename="poster.png",
+            headers=Headers({"content-type": "image/png"}),
+        )
+
+    @staticmethod
+    def _commit(service: PerformanceService) -> None:
+        """Выполнить действия, отложенные до commit."""
+        for callback, _ in service._session.info.pop("after_commit_callbacks", ()):
+            callback()
+
+    async def test_changed_poster_replaced_after_commit(self, service):
+        """Новый постер заменяет файл только после commit."""
+        poster = service._storage_path / "1" / "poster.png"
+        poster.parent.mkdir(parents=True)
+        poster.write_bytes(b"old")
+        performance = Performance(id=1, title="Тест")
+        service._performance_repo.update_with_sections = AsyncMock(
+            return_value=performance
+        )
+
+        result = await service.upload_poster(1, self._poster(b"new"), user_id=1)
+
+        assert result is performance
+        assert poster.read_bytes() == b"old"
+        self._commit(service)
+        assert poster.read_bytes() == b"new"
+        assert list(poster.parent.iterdir()) == [poster]
+
+    async def test_same_poster_not_replaced(self, service):
+        """Тот же постер: строка и файл не меняются."""
+        poster = service._storage_path / "1" / "poster.png"
+        poster.parent.mkdir(parents=True)
+        poster.write_bytes(b"same")
+        performance = Performance(id=1, title="Тест")
+        service._performance_repo.update_with_sections = AsyncMock(return_value=None)
+        service._performance_repo.get_with_sections = AsyncMock(
+            return_value=performance
+        )
+
+        result = await service.upload_poster(1, self._poster(b"same"), user_id=1)
+
+        assert result is performance
+        assert not service._session.info
+        assert list(poster.parent.iterdir()) == [poster]
+
+    async def test_missing_performance_not_found(self, service):
+        """Несуществующий спектакль: 404 и временный файл удалён."""
+        service._performance_repo.update_with_sections = AsyncMock(return_value=None)
+        service._performance_repo.get_with_sections = AsyncMock(return_value=None)
+
+        with pytest.raises(NotFoundError):
+            await service.upload_poster(999, self._poster(b"new"), user_id=1)
+
+        assert not service._session.info
+        assert list((service._storage_path / "999").iterdir()) == []
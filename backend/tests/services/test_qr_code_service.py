@@ -0,0 +1,65 @@
+"""
+Unit-тесты для QRCodeService.
+"""
+import pytest
+
+from app.services.qr_code_service import QRCodeService
+
+
+@pytest.mark.service
+class TestDecodeQRData:
+    """Разбор данных QR-кода совпадает с прежним построчным разбором."""
+
+    @pytest.mark.parametrize(
+        ("data", "expected"),
+        [
+            # Канонические форматы
+            (
+                "http://x/inventory/12|INV-2025-00001",
+                {"item_id": 12, "inventory_number": "INV-2025-00001",
+                 "url": "http://x/inventory/12|INV-2025-00001"},
+            ),
+            (
+                "http://x/inventory/12",
+                {"item_id": 12, "inventory_number": None,
+                 "url": "http://x/inventory/12"},
+            ),
+            (
+                "INV:5|INV-2025-00005",
+                {"item_id": 5, "inventory_number": "INV-2025-00005", "url": None},
+            ),
+            ("INV:5", {"item_id": 5, "inventory_number": None, "url": None}),
+            # Нестандартные строки
+            (
+                "http://x/inventory/12|A|B",
+                {"item_id": 12, "inventory_number": "B",
+                 "url": "http://x/inventory/12|A|B"},
+            ),
+            ("INV:5|A|B", {"item_id": 5, "inventory_number": "A", "url": None}),
+            ("INV:5|", {"item_id": 5, "inventory_number": "", "url": None}),
+            (
+                "http://x/inventory/3/inventory/5",
+                {"item_id": 3, "inventory_number": None,
+                 "url": "http://x/inventory/3/inventory/5"},
+            ),
+            (
+                "http://x/inventory/12/edit|N",
+                {"item_id": 12, "inventory_number": "N",
+                 "url": "http://x/inventory/12/edit|N"},
+            ),
+            ("plain|N", {"item_id": None, "inventory_number": "N", "url": None}),
+            ("plain", {"item_id": None, "inventory_number": None, "url": None}),
+        ],
+    )
+    def test_decode(self, data: str, expected: dict):
+        """Результат разбора."""
+        assert QRCodeService.decode_qr_data(data) == expected
+
+    @pytest.mark.parametrize(
+        "data",
+        ["INV:abc|N", "http://x/inventory/|N", "http://x/inventory/abc"],
+    )
+    def test_invalid_id_raises(self, data: str):
+        """Нечисловой ID, как и раньше, вызывает ValueError."""
+        with pytest.raises(ValueError):
+            QRCodeService.decode_qr_data(data)
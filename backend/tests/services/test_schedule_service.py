@@ -6,8 +6,16 @@ from unittest.mock import AsyncMock, MagicMock
 from datetime import date, time, datetime
 
 from app.services.schedule_service import ScheduleService
-from app.models.schedule import ScheduleEvent, EventStatus, EventType, EventParticipant, ParticipantStatus
-from app.core.exceptions import ValidationError
+from app.models.schedule import (
+    ScheduleEvent,
+    EventStatus,
+    EventType,
+    EventParticipant,
+    ParticipantRole,
+    ParticipantStatus,
+)
+from app.core.exceptions import NotFoundError, ValidationError
+from app.schemas.schedule import EventUpdate
 
 
 @pytest.mark.asyncio
@@ -20,18 +28,7 @@ class TestScheduleServiceEvents:
         mock_session = AsyncMock()
         service = ScheduleService(mock_session)
         
-        event = ScheduleEvent(
-            id=1,
-            title="Репетиция",
-            event_type=EventType.REHEARSAL,
-            status=EventStatus.PLANNED,
-            event_date=date(2026, 2, 1),
-            start_time=time(10, 0),
-        )
-        
-        service._event_repo.get_with_relations = AsyncMock(return_value=event)
-        service._event_repo.update_by_id = AsyncMock()
-        service._event_repo.get_with_relations = AsyncMock(
+        service._event_repo.update_with_relations = AsyncMock(
             return_value=ScheduleEvent(
                 id=1,
                 title="Репетиция",
@@ -52,18 +49,7 @@ class TestScheduleServiceEvents:
         mock_session = AsyncMock()
         service = ScheduleService(mock_session)
         
-        event = ScheduleEvent(
-            id=1,
-            title="Спектакль",
-            event_type=EventType.PERFORMANCE,
-            status=EventStatus.CONFIRMED,
-            event_date=date.today(),
-            start_time=time(19, 0),
-        )
-        
-        service._event_repo.get_with_relations = AsyncMock(return_value=event)
-        service._event_repo.update_by_id = AsyncMock()
-        service._event_repo.get_with_relations = AsyncMock(
+        service._event_repo.update_with_relations = AsyncMock(
             return_value=ScheduleEvent(
                 id=1,
                 title="Спектакль",
@@ -84,18 +70,7 @@ class TestScheduleServiceEvents:
         mock_session = AsyncMock()
         service = ScheduleService(mock_session)
         
-        event = ScheduleEvent(
-            id=1,
-            title="Спектакль",
-            event_type=EventType.PERFORMANCE,
-            status=EventStatus.IN_PROGRESS,
-            event_date=date.today(),
-            start_time=time(19, 0),
-        )
-        
-        service._event_repo.get_with_relations = AsyncMock(return_value=event)
-        service._event_repo.update_by_id = AsyncMock()
-        service._event_repo.get_with_relations = AsyncMock(
+        service._event_repo.update_with_relations = AsyncMock(
             return_value=ScheduleEvent(
                 id=1,
                 title="Спектакль",
@@ -124,10 +99,46 @@ class TestScheduleServiceEvents:
             start_time=time(19, 0),
         )
         
-        service._event_repo.get_with_relations = AsyncMock(return_value=event)
+        service._event_repo.update_with_relations = AsyncMock(return_value=None)
+        service._event_repo.get_status = AsyncMock(return_value=event.status)
         
         with pytest.raises(ValidationError):
             await service.cancel_event(event_id=1, user_id=1)
+        mock_session.commit.assert_not_called()
+
+    async def test_cancel_missing_event_not_found(self):
+        """Отмена несуществующего события."""
+        mock_session = AsyncMock()
+        service = ScheduleService(mock_session)
+        
+        service._event_repo.update_with_relations = AsyncMock(return_value=None)
+        service._event_repo.get_status = AsyncMock(return_value=None)
+        
+        with pytest.raises(NotFoundError):
+            await service.cancel_event(event_id=999, user_id=1)
+
+    async def test_delete_inactive_event_not_found(self):
+        """Повторное удаление события."""
+        mock_session = AsyncMock()
+        mock_session.execute.return_value = MagicMock(rowcount=0)
+        service = ScheduleService(mock_session)
+        
+        with pytest.raises(NotFoundError):
+            await service.delete_event(event_id=1, user_id=1)
+        mock_session.commit.assert_not_called()
+
+    async def test_update_missing_event_not_found(self):
+        """Обновление несуществующего события."""
+        mock_session = AsyncMock()
+        service = ScheduleService(mock_session)
+        
+        service._event_repo.update_with_relations = AsyncMock(return_value=None)
+        
+        with pytest.raises(NotFoundError):
+            await service.update_event(
+                event_id=999, data=EventUpdate(title="Новое"), user_id=1
+            )
+        mock_session.commit.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -138,32 +149,26 @@ class TestScheduleServiceParticipants:
     async def test_add_participant_success(self):
         """Успешное добавление участника."""
         mock_session = AsyncMock()
+        mock_session.add = MagicMock()
         service = ScheduleService(mock_session)
         
         event = ScheduleEvent(id=1, title="Репетиция", event_date=date.today(), start_time=time(10, 0))
         service._event_repo.get_with_relations = AsyncMock(return_value=event)
         service._participant_repo.get_by_user_and_event = AsyncMock(return_value=None)
-        service._participant_repo.get_by_id = AsyncMock(
-            return_value=EventParticipant(
-                id=1,
-                event_id=1,
-                user_id=5,
-                role="Актёр",
-                status=ParticipantStatus.INVITED,
-            )
-        )
         
         from app.schemas.schedule import ParticipantCreate
         data = ParticipantCreate(
             user_id=5,
-            role="Актёр",
+            role=ParticipantRole.PERFORMER,
             status=ParticipantStatus.INVITED,
         )
         
         result = await service.add_participant(event_id=1, data=data)
         
         assert result.user_id == 5
+        assert result.role == ParticipantRole.PERFORMER
         mock_session.commit.assert_called_once()
+        mock_session.refresh.assert_awaited_once_with(result, attribute_names=["user"])
 
     async def test_add_duplicate_participant_fails(self):
         """Попытка добавить дублирующегося участника."""
@@ -177,7 +182,7 @@ class TestScheduleServiceParticipants:
         service._participant_repo.get_by_user_and_event = AsyncMock(return_value=existing_participant)
         
         from app.schemas.schedule import ParticipantCreate
-        data = ParticipantCreate(user_id=5, role="Актёр", status=ParticipantStatus.INVITED)
+        data = ParticipantCreate(user_id=5, role=ParticipantRole.PERFORMER, status=ParticipantStatus.INVITED)
         
         with pytest.raises(ValidationError):
             await service.add_participant(event_id=1, data=data)
@@ -106,3 +106,21 @@ class TestPerformanceSectionRepository:
         result = await repo.get_by_type(perf.id, SectionType.PROPS)
         assert result is not None
         assert result.title == "Props List"
+    
+    async def test_has_type(self, test_db):
+        repo = PerformanceSectionRepository(test_db)
+        
+        perf = Performance(title="Test", status=PerformanceStatus.PREPARATION)
+        test_db.add(perf)
+        await test_db.commit()
+        await test_db.refresh(perf)
+        
+        test_db.add(PerformanceSection(
+            performance_id=perf.id,
+            section_type=SectionType.SOUND,
+            title="Sound"
+        ))
+        await test_db.commit()
+        
+        assert await repo.has_type(perf.id, SectionType.SOUND) is True
+        assert await repo.has_type(perf.id, SectionType.LIGHTING) is False